@@ -0,0 +1,209 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+ROLE_CLAIM = 'role'
+SUPERUSER_CLAIM = 'is_superuser'
+VERSION_CLAIM = 'ver'
+TOKEN_VERSION_KEY = 'user:token_version:{user_id}'
+# Версия для несуществующего пользователя, не совпадает ни с одним токеном.
+MISSING_USER_VERSION = -1
+
+
+class UserCache:
+    """
+    LRU-кэш пользователей в памяти процесса с ограничением по времени.
+
+    Хранятся значения полей, а не сами объекты: каждый запрос получает
+    свой экземпляр пользователя, и изменения в одном запросе не видны
+    другим. Записи сбрасываются сигналами при сохранении и удалении
+    пользователя; изменения в других процессах и через update()
+    становятся видны не позже чем через ttl секунд.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is None:
+                return None
+            expires_at, values = entry
+            if expires_at < time.monotonic():
+                del self._data[user_id]
+                return None
+            self._data.move_to_end(user_id)
+            return values
+
+    def set(self, user_id, values):
+        with self._lock:
+            self._data[user_id] = (time.monotonic() + self.ttl, values)
+            self._data.move_to_end(user_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._data.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+user_cache = UserCache(
+    maxsize=settings.JWT_USER_CACHE_SIZE, ttl=settings.JWT_USER_CACHE_TTL
+)
+
+
+def get_token_version(user_id):
+    """
+    Текущая версия токенов пользователя.
+
+    Хранится в общем кэше и читается из бд только при промахе. Сигналы
+    сбрасывают ключ при сохранении пользователя, в остальных процессах
+    (при кэше в памяти процесса) версия обновляется через
+    JWT_USER_CACHE_TTL секунд.
+    """
+    key = TOKEN_VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        version = get_user_model().objects.filter(pk=user_id).values_list(
+            'token_version', flat=True
+        ).first()
+        if version is None:
+            version = MISSING_USER_VERSION
+        cache.set(key, version, timeout=settings.JWT_USER_CACHE_TTL)
+    return version
+
+
+def invalidate_token_version(user_id):
+    cache.delete(TOKEN_VERSION_KEY.format(user_id=user_id))
+
+
+class RoleAccessToken(AccessToken):
+    """
+    Access-токен с ролью и версией пользователя в claims.
+
+    Неактивному пользователю claims не выдаются: такой токен всегда
+    проверяется по бд.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        if not user.is_active:
+            return token
+        token[ROLE_CLAIM] = user.role
+        token[SUPERUSER_CLAIM] = user.is_superuser
+        token[VERSION_CLAIM] = user.token_version
+        return token
+
+
+class TokenUser(SimpleLazyObject):
+    """
+    Пользователь, восстановленный из claims токена.
+
+    id, роль и признаки доступа читаются из токена без обращения к бд,
+    поэтому проверки пермишенов не делают запросов. Остальные атрибуты
+    (и присваивание во внешний ключ) загружают настоящего пользователя.
+    """
+
+    def __init__(self, token, load_user):
+        super().__init__(load_user)
+        # LazyObject перенаправляет setattr в загруженный объект.
+        self.__dict__['token'] = token
+
+    @property
+    def id(self):
+        return self.token[api_settings.USER_ID_CLAIM]
+
+    pk = id
+
+    @property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+    @property
+    def is_superuser(self):
+        return self.token[SUPERUSER_CLAIM]
+
+    @property
+    def is_admin(self):
+        return self.role == get_user_model().ADMIN_ROLE
+
+    @property
+    def is_manager(self):
+        return self.role in get_user_model().MANAGER_ROLES
+
+    @property
+    def is_authenticated(self):
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация с кэшированием пользователя.
+
+    Если в токене есть claims роли актуальной версии, возвращается
+    TokenUser без запроса к бд. Иначе пользователь по id из токена
+    берется из user_cache, запрос в бд выполняется только при промахе.
+    """
+
+    def get_user(self, validated_token):
+        if self.has_actual_claims(validated_token):
+            return TokenUser(
+                validated_token, lambda: self.get_db_user(validated_token)
+            )
+        return self.get_db_user(validated_token)
+
+    def has_actual_claims(self, validated_token):
+        """Проверяет, что роль в токене выдана для текущей версии."""
+        version = validated_token.get(VERSION_CLAIM)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        return (
+            version is not None
+            and user_id is not None
+            and not api_settings.CHECK_REVOKE_TOKEN
+            and ROLE_CLAIM in validated_token
+            and SUPERUSER_CLAIM in validated_token
+            and get_token_version(user_id) == version
+        )
+
+    def get_db_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None or api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        values = user_cache.get(user_id)
+        if values is not None:
+            return self.user_model.from_db(
+                DEFAULT_DB_ALIAS, self.get_field_names(), values
+            )
+        user = super().get_user(validated_token)
+        user_cache.set(user_id, tuple(
+            getattr(user, name) for name in self.get_field_names()
+        ))
+        return user
+
+    def get_field_names(self):
+        return [
+            field.attname for field in self.user_model._meta.concrete_fields
+        ]
@@ -0,0 +1,123 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from rest_framework import serializers
+
+from .cache import bump_catalog_version
+from api_yamdb.settings import MAX_SCORE, MIN_SCORE
+from reviews.models import CustomUser, Review, ScoreCounter, Title
+
+REVIEW_EXISTS = 'Такой отзыв уже существует.'
+
+
+class BulkReviewSerializer(serializers.Serializer):
+    """Отзыв из партнерского импорта, автор указывается по username."""
+
+    title = serializers.IntegerField()
+    author = serializers.CharField(max_length=150)
+    text = serializers.CharField()
+    score = serializers.IntegerField(min_value=MIN_SCORE, max_value=MAX_SCORE)
+
+
+class BulkReviewImporter:
+    """
+    Пакетный импорт отзывов.
+
+    Отзывы проверяются пачками по batch_size: произведения, авторы и уже
+    существующие отзывы пачки загружаются тремя запросами, валидные отзывы
+    вставляются через bulk_create. Весь импорт идет в одной транзакции,
+    рейтинг и счетчики оценок обновляются один раз на произведение.
+    """
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.results = []
+        self.seen = set()
+        self.rating_deltas = defaultdict(lambda: [0, 0])
+        self.score_counts = Counter()
+
+    def run(self, items):
+        """Импортирует отзывы и возвращает результат по каждому элементу."""
+        self.results = [None] * len(items)
+        with transaction.atomic():
+            for start in range(0, len(items), self.batch_size):
+                self.import_batch(
+                    start, items[start:start + self.batch_size]
+                )
+            self.update_aggregates()
+            if self.seen:
+                transaction.on_commit(bump_catalog_version)
+        return self.results
+
+    def error(self, index, errors):
+        self.results[index] = {
+            'index': index, 'status': 'error', 'errors': errors
+        }
+
+    def validate_batch(self, start, batch):
+        valid = []
+        for index, item in enumerate(batch, start):
+            serializer = BulkReviewSerializer(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                self.error(index, serializer.errors)
+        return valid
+
+    def import_batch(self, start, batch):
+        valid = self.validate_batch(start, batch)
+        title_ids = set(Title.objects.filter(
+            id__in={data['title'] for _, data in valid}
+        ).values_list('id', flat=True))
+        author_ids = dict(CustomUser.objects.filter(
+            username__in={data['author'] for _, data in valid}
+        ).values_list('username', 'id'))
+        existing = set(Review.objects.filter(
+            title_id__in=title_ids, author_id__in=author_ids.values()
+        ).values_list('title_id', 'author_id'))
+
+        reviews = []
+        for index, data in valid:
+            key = (data['title'], author_ids.get(data['author']))
+            if data['title'] not in title_ids:
+                self.error(index, {'title': ['Произведение не найдено.']})
+            elif key[1] is None:
+                self.error(index, {'author': ['Пользователь не найден.']})
+            elif key in existing or key in self.seen:
+                self.error(index, {'non_field_errors': [REVIEW_EXISTS]})
+            else:
+                self.seen.add(key)
+                reviews.append((index, Review(
+                    title_id=key[0], author_id=key[1],
+                    text=data['text'], score=data['score'],
+                )))
+        if not reviews:
+            return
+
+        Review.objects.bulk_create(
+            [review for _, review in reviews], batch_size=self.batch_size
+        )
+        # SQLite в Django 3.2 не возвращает id из bulk_create.
+        created_ids = {
+            (title_id, author_id): pk
+            for pk, title_id, author_id in Review.objects.filter(
+                title_id__in={review.title_id for _, review in reviews},
+                author_id__in={review.author_id for _, review in reviews},
+            ).values_list('id', 'title_id', 'author_id')
+        }
+        for index, review in reviews:
+            self.results[index] = {
+                'index': index,
+                'status': 'created',
+                'id': created_ids[(review.title_id, review.author_id)],
+            }
+            self.rating_deltas[review.title_id][0] += review.score
+            self.rating_deltas[review.title_id][1] += 1
+            self.score_counts[(review.title_id, review.score)] += 1
+
+    def update_aggregates(self):
+        """bulk_create не вызывает сигналы - обновляем агрегаты сами."""
+        for title_id, (total, count) in self.rating_deltas.items():
+            Title.objects.update_rating(title_id, total, count)
+        for (title_id, score), amount in self.score_counts.items():
+            ScoreCounter.objects.increment(title_id, score, amount)
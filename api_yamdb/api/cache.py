@@ -0,0 +1,92 @@
+import time
+from hashlib import md5
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+CATALOG_VERSION_KEY = 'catalog:version'
+CACHE_HITS_KEY = 'catalog:cache:hits'
+CACHE_MISSES_KEY = 'catalog:cache:misses'
+
+
+def _increment(key, initial):
+    """Атомарно увеличивает счетчик в кэше, создавая его при отсутствии."""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, initial, timeout=None)
+        return cache.incr(key)
+
+
+def get_catalog_version():
+    """
+    Возвращает текущую версию каталога.
+
+    Начальное значение берется от текущего времени, чтобы после вытеснения
+    ключа из кэша версия не совпала ни с одной из уже использованных.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """Инвалидирует все закэшированные ответы каталога за O(1)."""
+    return _increment(CATALOG_VERSION_KEY, time.time_ns())
+
+
+def build_list_cache_key(prefix, request, version):
+    """
+    Собирает ключ кэша из версии каталога и нормализованных параметров.
+
+    Параметры сортируются, пустые значения отбрасываются, поэтому
+    ?year=1984&genre=drama и ?genre=drama&year=1984 дают один ключ.
+    """
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+        if value != ''
+    )
+    digest = md5(
+        f'{request.build_absolute_uri(request.path)}?{urlencode(params)}'
+        .encode()
+    ).hexdigest()
+    return f'{prefix}:{version}:{digest}'
+
+
+def get_cached_list(key):
+    """Достает ответ из кэша и обновляет счетчики попаданий и промахов."""
+    data = cache.get(key)
+    _increment(CACHE_MISSES_KEY if data is None else CACHE_HITS_KEY, 0)
+    return data
+
+
+def set_cached_list(key, data):
+    cache.set(key, data, timeout=settings.CATALOG_CACHE_TIMEOUT)
+
+
+def get_slug_ids(model, slugs):
+    """
+    Сопоставляет slug-и справочника с их id.
+
+    Справочник целиком кэшируется под текущей версией каталога, поэтому
+    фильтры не делают join по slug на каждый запрос.
+    """
+    key = f'slugs:{model._meta.label_lower}:{get_catalog_version()}'
+    mapping = cache.get(key)
+    if mapping is None:
+        mapping = dict(model.objects.values_list('slug', 'id'))
+        cache.set(key, mapping, timeout=settings.CATALOG_CACHE_TIMEOUT)
+    return {slug: mapping[slug] for slug in slugs if slug in mapping}
+
+
+def get_cache_stats():
+    """Возвращает счетчики попаданий и промахов кэша каталога."""
+    return {
+        'hits': cache.get(CACHE_HITS_KEY, 0),
+        'misses': cache.get(CACHE_MISSES_KEY, 0),
+    }
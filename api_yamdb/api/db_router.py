@@ -0,0 +1,76 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+RECENT_WRITE_KEY = 'db:recent_write:{user_id}'
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def is_read_replica_enabled():
+    return (
+        settings.READ_REPLICA_ENABLED
+        and settings.READ_REPLICA_ALIAS in settings.DATABASES
+    )
+
+
+def use_read_replica():
+    """Направляет чтения до конца текущего запроса на реплику."""
+    if is_read_replica_enabled():
+        _read_alias.set(settings.READ_REPLICA_ALIAS)
+
+
+def reset_read_alias():
+    _read_alias.set(None)
+
+
+def get_read_alias():
+    return _read_alias.get()
+
+
+def mark_recent_write(user):
+    """
+    Запоминает, что пользователь только что изменил данные.
+
+    В течение READ_YOUR_WRITES_WINDOW секунд его чтения идут в основную
+    бд, чтобы отставание реплики не прятало его собственные изменения.
+    """
+    cache.set(
+        RECENT_WRITE_KEY.format(user_id=user.pk), True,
+        timeout=settings.READ_YOUR_WRITES_WINDOW
+    )
+
+
+def has_recent_write(user):
+    if not user.is_authenticated:
+        return False
+    return cache.get(RECENT_WRITE_KEY.format(user_id=user.pk), False)
+
+
+class ReadReplicaRouter:
+    """
+    Роутер бд: чтения, помеченные ReadReplicaMixin, идут на реплику.
+
+    Все записи и миграции идут в основную бд, реплика обновляется
+    репликацией (локально - командой sync_replica).
+    """
+
+    def db_for_read(self, model, **hints):
+        return get_read_alias()
+
+    def db_for_write(self, model, **hints):
+        # Явно, иначе объект, прочитанный с реплики, сохранялся бы в нее.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, settings.READ_REPLICA_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == settings.READ_REPLICA_ALIAS:
+            return False
+        return None
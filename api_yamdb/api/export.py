@@ -0,0 +1,71 @@
+from collections import defaultdict
+
+from django.db.models import Q
+from rest_framework.renderers import JSONRenderer
+
+from .serializers import CommentSerializer, ReviewSerializer
+from reviews.models import Comment, Review
+
+
+class ReviewExporter:
+    """
+    Потоковая выгрузка отзывов произведения в NDJSON.
+
+    Отзывы читаются через iterator(chunk_size), комментарии подгружаются
+    одним запросом на пачку отзывов, поэтому потребление памяти не
+    зависит от количества отзывов. С since выгружаются отзывы, измененные
+    с этого момента, а с комментариями - еще и отзывы с измененными
+    комментариями.
+    """
+
+    renderer = JSONRenderer()
+
+    def __init__(self, title, since=None, with_comments=False,
+                 chunk_size=500):
+        self.title = title
+        self.since = since
+        self.with_comments = with_comments
+        self.chunk_size = chunk_size
+
+    def get_queryset(self):
+        reviews = Review.objects.filter(title=self.title).select_related(
+            'author'
+        ).order_by('id')
+        if self.since is not None:
+            changed = Q(updated_at__gte=self.since)
+            if self.with_comments:
+                # Изменение комментария не трогает отзыв: такие отзывы
+                # тоже попадают в выгрузку вместе с комментариями.
+                changed |= Q(pk__in=Comment.objects.filter(
+                    updated_at__gte=self.since
+                ).values('review_id'))
+            reviews = reviews.filter(changed)
+        return reviews
+
+    def __iter__(self):
+        chunk = []
+        for review in self.get_queryset().iterator(chunk_size=self.chunk_size):
+            chunk.append(review)
+            if len(chunk) == self.chunk_size:
+                yield from self.render_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self.render_chunk(chunk)
+
+    def get_comments(self, reviews):
+        comments = defaultdict(list)
+        for comment in Comment.objects.filter(
+            review__in=reviews
+        ).select_related('author').order_by('id'):
+            comments[comment.review_id].append(comment)
+        return comments
+
+    def render_chunk(self, reviews):
+        comments = self.get_comments(reviews) if self.with_comments else {}
+        for review in reviews:
+            data = ReviewSerializer(review).data
+            if self.with_comments:
+                data['comments'] = CommentSerializer(
+                    comments.get(review.id, []), many=True
+                ).data
+            yield self.renderer.render(data) + b'\n'
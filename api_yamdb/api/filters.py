@@ -1,16 +1,150 @@
+from django.conf import settings
+from django.db.models import Count, Exists, OuterRef, Q, Value
+from django.db.models.functions import Lower
 from django_filters import rest_framework
+from rest_framework.filters import OrderingFilter, SearchFilter
 
-from reviews.models import Title
+from .cache import get_slug_ids
+from reviews.fulltext import search_titles, user_index
+from reviews.models import Category, Genre, GenreTitle, Title
+
+GENRE_MODE_ANY = 'any'
+GENRE_MODE_ALL = 'all'
+
+SEARCH_MODE_PREFIX = 'prefix'
+SEARCH_MODE_SUBSTRING = 'substring'
+# Больше любого символа в username и email: верхняя граница диапазона
+# строк, начинающихся с префикса.
+MAX_CHAR = '\U0010ffff'
+
+
+def parse_slugs(value):
+    """Разбирает список slug-ов через запятую."""
+    return {slug.strip() for slug in value.split(',') if slug.strip()}
+
+
+class StableOrderingFilter(OrderingFilter):
+    """
+    Сортировка с добавлением id в конец.
+
+    При равных значениях полей сортировки порядок остается стабильным,
+    и страницы пагинации не пересекаются.
+    """
+
+    tiebreaker = 'id'
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        if {self.tiebreaker, f'-{self.tiebreaker}'} & set(ordering):
+            return ordering
+        return (*ordering, self.tiebreaker)
 
 
 class TitleFilterSet(rest_framework.FilterSet):
-    """Фильтры для вьюсета произведений."""
-    category = rest_framework.CharFilter(field_name='category__slug')
-    genre = rest_framework.CharFilter(field_name='genre__slug')
-    name = rest_framework.CharFilter(
-        field_name='name', lookup_expr='icontains'
+    """
+    Фильтры для вьюсета произведений.
+
+    category и genre принимают несколько slug-ов через запятую.
+    genre_mode задает, должно ли произведение иметь хотя бы один (any)
+    или все (all) перечисленные жанры.
+    """
+    category = rest_framework.CharFilter(method='filter_category')
+    genre = rest_framework.CharFilter(method='filter_genre')
+    genre_mode = rest_framework.ChoiceFilter(
+        choices=(
+            (GENRE_MODE_ANY, 'любой из жанров'),
+            (GENRE_MODE_ALL, 'все жанры'),
+        ),
+        method='filter_genre_mode',
     )
+    name = rest_framework.CharFilter(method='filter_name')
 
     class Meta:
         model = Title
-        fields = ('category', 'genre', 'name', 'year',)
+        fields = ('category', 'genre', 'genre_mode', 'name', 'year',)
+
+    def filter_category(self, queryset, name, value):
+        category_ids = get_slug_ids(Category, parse_slugs(value))
+        return queryset.filter(category_id__in=category_ids.values())
+
+    def filter_genre(self, queryset, name, value):
+        """
+        Фильтрация по жанрам без join-а и дублей строк.
+
+        any - EXISTS по связям с жанрами, all - GROUP BY/HAVING по
+        количеству совпавших жанров у произведения.
+        """
+        slugs = parse_slugs(value)
+        genre_ids = get_slug_ids(Genre, slugs)
+        mode = self.form.cleaned_data.get('genre_mode') or GENRE_MODE_ANY
+        if mode == GENRE_MODE_ALL:
+            if len(genre_ids) != len(slugs):
+                return queryset.none()
+            return queryset.filter(
+                id__in=GenreTitle.objects.filter(
+                    genre_id__in=genre_ids.values()
+                ).values('title').annotate(
+                    genres_count=Count('genre')
+                ).filter(
+                    genres_count=len(genre_ids)
+                ).values('title')
+            )
+        return queryset.filter(
+            Exists(GenreTitle.objects.filter(
+                title=OuterRef('pk'), genre_id__in=genre_ids.values()
+            ))
+        )
+
+    def filter_genre_mode(self, queryset, name, value):
+        """Режим учитывается в filter_genre, здесь ничего не делаем."""
+        return queryset
+
+    def filter_name(self, queryset, name, value):
+        """Поиск по вхождению в название через полнотекстовый индекс."""
+        return search_titles(queryset, value)
+
+
+class UserSearchFilter(SearchFilter):
+    """
+    Поиск пользователей по username и email.
+
+    По умолчанию ищет по префиксу без учета регистра: условие
+    lower(поле) >= lower(префикс) AND lower(поле) < lower(префикс + MAX_CHAR)
+    обслуживается индексами по Lower('username') и Lower('email').
+    ?search_mode=substring ищет подстроку через триграммный индекс
+    (USER_SEARCH_TRIGRAM), без него - через icontains по search_fields.
+    """
+
+    search_mode_param = 'search_mode'
+    prefix_fields = ('username', 'email')
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.search_param, '').strip()
+        if not value:
+            return queryset
+        mode = request.query_params.get(
+            self.search_mode_param, SEARCH_MODE_PREFIX
+        )
+        if mode == SEARCH_MODE_SUBSTRING:
+            return self.search_substring(request, queryset, view, value)
+        return self.search_prefix(queryset, value)
+
+    def search_prefix(self, queryset, value):
+        condition = Q()
+        for field in self.prefix_fields:
+            alias = f'{field}_lower'
+            queryset = queryset.alias(**{alias: Lower(field)})
+            condition |= Q(**{
+                f'{alias}__gte': Lower(Value(value)),
+                f'{alias}__lt': Lower(Value(value + MAX_CHAR)),
+            })
+        return queryset.filter(condition)
+
+    def search_substring(self, request, queryset, view, value):
+        if settings.USER_SEARCH_TRIGRAM:
+            result = user_index.search(queryset, value)
+            if result is not None:
+                return result
+        return super().filter_queryset(request, queryset, view)
@@ -0,0 +1,94 @@
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.throttling import (
+    IdentityTokenBucketThrottle,
+    IPTokenBucketThrottle,
+    get_bucket_store,
+)
+from api.views import UserAPIView
+
+
+class Command(BaseCommand):
+    """
+    Описание команды benchmark_throttle.
+
+    Измеряет накладные расходы троттлинга регистрации на один запрос
+    для хранилищ в памяти и в SQLite-файле. Запросы приходят с разных
+    адресов и имен, поэтому лимиты не срабатывают и измеряется полный
+    путь проверки: разбор тела, две корзины по username/email и одна
+    по IP.
+    """
+
+    help = 'Измеряет время проверки троттлинга на один запрос.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=10000,
+            help='Количество запросов на каждое хранилище.',
+        )
+        parser.add_argument(
+            '--sqlite-path',
+            help='Файл SQLite-хранилища для замера. По умолчанию - '
+                 'временный файл, удаляемый после замера.',
+        )
+
+    def build_requests(self, count):
+        factory = APIRequestFactory()
+        return [
+            Request(
+                factory.post(
+                    '/api/v1/auth/signup/',
+                    {'username': f'user{index}',
+                     'email': f'user{index}@yamdb.fake'},
+                    format='json',
+                    REMOTE_ADDR=f'10.{index // 65536 % 256}.'
+                                f'{index // 256 % 256}.{index % 256}',
+                ),
+                parsers=[JSONParser()],
+            )
+            for index in range(count)
+        ]
+
+    def measure(self, requests):
+        view = UserAPIView()
+        throttles = (IPTokenBucketThrottle(), IdentityTokenBucketThrottle())
+        get_bucket_store().clear()
+        started = time.perf_counter()
+        for request in requests:
+            for throttle in throttles:
+                throttle.allow_request(request, view)
+        return (time.perf_counter() - started) / len(requests)
+
+    def handle(self, *args, **options) -> Optional[str]:
+        """Основное действие при выполнение команды."""
+        if options['sqlite_path']:
+            return self.benchmark(options['requests'], options['sqlite_path'])
+        with tempfile.TemporaryDirectory() as directory:
+            return self.benchmark(
+                options['requests'], Path(directory) / 'throttle.sqlite3'
+            )
+
+    def benchmark(self, count, sqlite_path):
+        for store, overrides in (
+            ('memory', {'AUTH_THROTTLE_STORE': 'memory'}),
+            ('sqlite', {'AUTH_THROTTLE_STORE': 'sqlite',
+                        'AUTH_THROTTLE_SQLITE_PATH': sqlite_path}),
+        ):
+            # Тела разбираются при первой проверке, поэтому запросы
+            # создаются заново для каждого хранилища.
+            requests = self.build_requests(count)
+            with override_settings(**overrides):
+                per_request = self.measure(requests)
+            print(f'  > {store}: {per_request * 1e6:.1f} мкс на запрос')
+        return f'Замерено запросов на хранилище: {count}'
@@ -0,0 +1,27 @@
+from typing import Optional
+
+from django.core.management.base import BaseCommand
+
+from api.cache import get_cache_stats, get_catalog_version
+
+
+class Command(BaseCommand):
+    """
+    Описание команды catalog_cache_stats.
+
+    Выводит счетчики попаданий и промахов кэша списков каталога и
+    текущую версию каталога. Счетчики хранятся в общем кэше, поэтому
+    при общем бэкенде (memcached, redis) видны данные всех воркеров.
+    """
+
+    help = 'Показывает статистику кэша каталога.'
+
+    def handle(self, *args, **options) -> Optional[str]:
+        """Основное действие при выполнение команды."""
+        stats = get_cache_stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total if total else 0
+        print(f'  > версия каталога: {get_catalog_version()}')
+        print(f'  > попаданий: {stats["hits"]}')
+        print(f'  > промахов: {stats["misses"]}')
+        return f'Доля попаданий: {ratio:.1%}'
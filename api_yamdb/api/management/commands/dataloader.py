@@ -1,11 +1,16 @@
 import csv
 import os
+import time
+from itertools import islice
 
 from typing import Optional
-from django.core.management.base import BaseCommand
-from django.db import models
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
 
+from api.cache import bump_catalog_version
 from api_yamdb.settings import BASE_DIR
+from reviews.fulltext import rebuild_title_index, user_index
 from reviews.models import (
     Category,
     Comment,
@@ -13,6 +18,7 @@ from reviews.models import (
     Genre,
     GenreTitle,
     Review,
+    ScoreCounter,
     Title
 )
 
@@ -32,7 +38,27 @@ CSV_TO_MODEL_MAPPING: dict[str, models.Model] = {
 
 
 class Command(BaseCommand):
-    """Описание команды dataloader."""
+    """
+    Описание команды dataloader.
+
+    По умолчанию каждая строка сохраняется отдельным save(). В режиме
+    --bulk файл читается пачками по --batch-size строк, внешние ключи
+    проверяются по заранее загруженным множествам id, строки вставляются
+    через bulk_create, а весь файл загружается в одной транзакции.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Загружать файлы пачками через bulk_create.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество строк в пачке для режима --bulk.',
+        )
 
     def handle(self, *args, **options) -> Optional[str]:
         """Основное действие при выполнение команды."""
@@ -40,7 +66,7 @@ class Command(BaseCommand):
         # Проверяем пути
         try:
             self.check_dir(STATIC_DIR_NAME, BASE_DIR)
-            self.check_dir(DATA_DIR_NAME, STATIC_DIR_NAME)
+            self.check_dir(DATA_DIR_NAME, BASE_DIR / STATIC_DIR_NAME)
             csv_files = self.find_csv_files()
         except Exception as exception:
             # Текст ошибки слишком большой, можно проще:
@@ -60,26 +86,128 @@ class Command(BaseCommand):
 
         # Берем валидный файл (для которого описана выше модель)
         print('Начинаем загрузку данных:')
+        load_file = self.load_file
+        if options['bulk']:
+            def load_file(filename):
+                self.bulk_load_file(filename, options['batch_size'])
         for filename in valid_csv_files:
-            try:
-                model = CSV_TO_MODEL_MAPPING.get(filename)
-                print(f'  > {filename} - ', end='')
-                with open(FULL_DIR / filename, 'r', encoding='utf-8') as data:
-                    for line in csv.DictReader(data):
-                        # Для некоторых пришлось создать менеджер с этой
-                        # командой, т.к. файлы "грязные"
-                        if hasattr(model.objects, 'create_object'):
-                            model.objects.create_object(**line)
-                        # Там, где менеджера нет - подойдет обычный save
-                        else:
-                            instance = model(**line)
-                            instance.save()
-                print('успешно загружен.')
-            except Exception as e:
-                print(f'ошибка: {e}')
-                continue
+            load_file(filename)
+        if options['bulk']:
+            # Файлы уже зафиксированы каждый в своей транзакции.
+            bump_catalog_version()
         return 'Данные успешно загружены'
 
+    def load_file(self, filename):
+        """Загружает файл построчно через save()."""
+        try:
+            model = CSV_TO_MODEL_MAPPING.get(filename)
+            print(f'  > {filename} - ', end='')
+            with open(FULL_DIR / filename, 'r', encoding='utf-8') as data:
+                for line in csv.DictReader(data):
+                    # Для некоторых пришлось создать менеджер с этой
+                    # командой, т.к. файлы "грязные"
+                    if hasattr(model.objects, 'create_object'):
+                        model.objects.create_object(**line)
+                    # Там, где менеджера нет - подойдет обычный save
+                    else:
+                        instance = model(**line)
+                        instance.save()
+            print('успешно загружен.')
+        except Exception as e:
+            print(f'ошибка: {e}')
+
+    def bulk_load_file(self, filename, batch_size):
+        """Загружает файл пачками в одной транзакции, печатает скорость."""
+        model = CSV_TO_MODEL_MAPPING.get(filename)
+        print(f'  > {filename} - ', end='')
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                with open(FULL_DIR / filename, 'r', encoding='utf-8') as data:
+                    count = self.bulk_insert(
+                        model, csv.DictReader(data), batch_size
+                    )
+                self.update_denormalized(model)
+        except Exception as e:
+            print(f'ошибка: {e}')
+            return
+        elapsed = time.perf_counter() - started
+        print(
+            f'успешно загружен: {count} строк за {elapsed:.2f} с '
+            f'({count / elapsed:.0f} строк/с).'
+        )
+
+    def get_id_maps(self, model, columns):
+        """
+        Загружает id связанных объектов для колонок-внешних ключей.
+
+        Возвращает словарь {колонка: (поле, множество id)}, колонки
+        вида 'category' и 'title_id' приводятся к полю модели.
+        """
+        id_maps = {}
+        for column in columns:
+            field = model._meta.get_field(column)
+            if field.many_to_one:
+                id_maps[column] = (field, set(
+                    field.related_model.objects.values_list('pk', flat=True)
+                ))
+        return id_maps
+
+    def build_instance(self, model, line, id_maps):
+        values = {}
+        for column, value in line.items():
+            if column in id_maps:
+                field, ids = id_maps[column]
+                value = field.target_field.to_python(value)
+                if value not in ids:
+                    raise CommandError(
+                        f'{field.related_model.__name__} с id={value} '
+                        f'не существует (строка id={line.get("id")})'
+                    )
+                values[field.attname] = value
+            else:
+                values[column] = model._meta.get_field(column).to_python(
+                    value
+                )
+        return model(**values)
+
+    def bulk_insert(self, model, reader, batch_size):
+        """Вставляет строки пачками, возвращает их число."""
+        id_maps = self.get_id_maps(model, reader.fieldnames)
+        count = 0
+        while True:
+            chunk = list(islice(reader, batch_size))
+            if not chunk:
+                break
+            instances = [
+                self.build_instance(model, line, id_maps) for line in chunk
+            ]
+            model.objects.bulk_create(instances, batch_size=batch_size)
+            count += len(instances)
+        return count
+
+    def update_denormalized(self, model):
+        """
+        Обновляет то, что при save() поддерживают сигналы.
+
+        bulk_create сигналов не отправляет, поэтому рейтинги, счетчики
+        и FTS-индексы пересчитываются один раз на файл. Связанные объекты
+        выбираются подзапросом, а не списком id: список на десятки тысяч
+        параметров не пройдет лимит переменных SQLite.
+        """
+        if model is Title:
+            rebuild_title_index()
+        elif model is CustomUser and settings.USER_SEARCH_TRIGRAM:
+            user_index.rebuild()
+        elif model is Review:
+            title_ids = Review.objects.values('title_id')
+            Title.objects.filter(pk__in=title_ids).rebuild_ratings()
+            ScoreCounter.objects.rebuild(title_ids)
+        elif model is Comment:
+            Review.objects.filter(
+                pk__in=Comment.objects.values('review_id')
+            ).recount_comments()
+
     def check_dir(self, dir, path):
         """Проверка пути."""
         static_dir = os.path.join(path, dir)
@@ -88,10 +216,11 @@ class Command(BaseCommand):
 
     def find_csv_files(self) -> list[str]:
         """Поиск csv-файлов."""
-        DIR = f'{STATIC_DIR_NAME}/{DATA_DIR_NAME}'
         csv_files = [
-            file for file in os.listdir(DIR) if file.endswith('.csv')
+            file for file in os.listdir(FULL_DIR) if file.endswith('.csv')
         ]
         if not csv_files:
-            raise Exception(f'Не найдены CSV-файлы в дирректории {DIR}')
+            raise Exception(
+                f'Не найдены CSV-файлы в дирректории {FULL_DIR}'
+            )
         return csv_files
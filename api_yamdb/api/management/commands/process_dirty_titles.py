@@ -0,0 +1,88 @@
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.cache import bump_catalog_version
+from reviews.models import DirtyTitle
+
+
+class Command(BaseCommand):
+    """
+    Описание команды process_dirty_titles.
+
+    Воркер отложенного пересчета рейтингов (режим DEFERRED_RATINGS).
+    Забирает из очереди произведения, отмеченные отзывами, и пачками
+    пересчитывает их рейтинг и счетчики оценок. Сколько бы отзывов ни
+    пришло на произведение между проходами, пересчет будет один.
+    """
+
+    help = 'Пересчитывает рейтинги произведений из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать в цикле, опрашивая очередь с интервалом.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.RATING_WORKER_INTERVAL,
+            help='Пауза между проходами в секундах.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.RATING_WORKER_BATCH_SIZE,
+            help='Количество произведений в одной пачке.',
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Только показать глубину очереди.',
+        )
+
+    def print_stats(self):
+        stats = DirtyTitle.objects.get_queue_stats()
+        print(
+            f'  > в очереди: {stats["depth"]}, '
+            f'самая старая отметка: {stats["oldest_age"]:.1f} с'
+        )
+        if stats['oldest_age'] > settings.RATING_MAX_STALENESS:
+            print('  > очередь отстает больше RATING_MAX_STALENESS')
+        return stats
+
+    def drain(self, batch_size):
+        """Опустошает очередь, возвращает число пересчитанных произведений."""
+        processed = 0
+        while True:
+            title_ids = DirtyTitle.objects.process(batch_size)
+            if not title_ids:
+                break
+            processed += len(title_ids)
+        if processed:
+            bump_catalog_version()
+        return processed
+
+    def handle(self, *args, **options) -> Optional[str]:
+        """Основное действие при выполнение команды."""
+        if options['stats']:
+            stats = self.print_stats()
+            return f'Глубина очереди: {stats["depth"]}'
+        if not options['loop']:
+            processed = self.drain(options['batch_size'])
+            return f'Рейтинги пересчитаны, произведений: {processed}'
+
+        try:
+            while True:
+                close_old_connections()
+                processed = self.drain(options['batch_size'])
+                if processed:
+                    print(f'  > пересчитано произведений: {processed}')
+                    self.print_stats()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            return 'Воркер остановлен'
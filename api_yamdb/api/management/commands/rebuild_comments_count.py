@@ -0,0 +1,40 @@
+from typing import Optional
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.models import Review
+
+
+class Command(BaseCommand):
+    """
+    Описание команды rebuild_comments_count.
+
+    Сверяет денормализованные счетчики комментариев отзывов с таблицей
+    комментариев и исправляет расхождения.
+    """
+
+    help = 'Пересчитывает количество комментариев у отзывов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить расхождения, не исправляя их.',
+        )
+
+    def handle(self, *args, **options) -> Optional[str]:
+        """Основное действие при выполнение команды."""
+        if options['check']:
+            drift = Review.objects.get_comments_count_drift()
+        else:
+            drift = Review.objects.rebuild_comments_count()
+
+        for review, count in drift:
+            print(f'  > {review.id}: {review.comments_count} -> {count}')
+        if options['check'] and drift:
+            raise CommandError(
+                f'Найдено расхождений счетчиков комментариев: {len(drift)}'
+            )
+        if options['check']:
+            return 'Расхождений счетчиков комментариев не найдено'
+        return f'Счетчики комментариев пересчитаны, исправлено: {len(drift)}'
@@ -0,0 +1,54 @@
+from typing import Optional
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.cache import bump_catalog_version
+from reviews.models import ScoreCounter, Title
+
+
+class Command(BaseCommand):
+    """
+    Описание команды rebuild_ratings.
+
+    Пересчитывает денормализованные агрегаты рейтинга и счетчики оценок
+    произведений по таблице отзывов и сообщает о найденных расхождениях.
+    """
+
+    help = 'Пересчитывает рейтинги произведений по отзывам.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить расхождения, не исправляя их.',
+        )
+
+    def handle(self, *args, **options) -> Optional[str]:
+        """Основное действие при выполнение команды."""
+        if options['check']:
+            drift = Title.objects.get_rating_drift()
+        else:
+            drift = Title.objects.rebuild_ratings()
+        histogram_drift = ScoreCounter.objects.get_drift()
+        if histogram_drift and not options['check']:
+            ScoreCounter.objects.rebuild(histogram_drift)
+        if drift and not options['check']:
+            # bulk_update не отправляет сигналы: закэшированные под текущей
+            # версией списки со старыми рейтингами нужно инвалидировать.
+            bump_catalog_version()
+
+        for title, total, count in drift:
+            print(
+                f'  > {title.id}: сумма {title.rating_sum} -> {total}, '
+                f'количество {title.rating_count} -> {count}'
+            )
+        for title_id in sorted(histogram_drift):
+            print(f'  > {title_id}: счетчики оценок разошлись с отзывами')
+        total_drift = len(drift) + len(histogram_drift)
+        if options['check'] and total_drift:
+            raise CommandError(
+                f'Найдено расхождений рейтинга: {total_drift}'
+            )
+        if options['check']:
+            return 'Расхождений рейтинга не найдено'
+        return f'Рейтинги пересчитаны, исправлено: {total_drift}'
@@ -0,0 +1,112 @@
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from reviews.models import OutboxEmail
+
+
+class Command(BaseCommand):
+    """
+    Описание команды send_outbox_emails.
+
+    Доставляет письма из таблицы OutboxEmail. Все письма прохода идут
+    через одно соединение с почтовым бэкендом, как в send_mass_mail, но
+    отправляются по одному, чтобы статус фиксировался для каждого.
+    Неудачные попытки повторяются с экспоненциальной паузой.
+    Рассчитана на один запущенный воркер.
+    """
+
+    help = 'Отправляет письма из очереди исходящих писем.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать в цикле, опрашивая очередь с интервалом.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между проходами в секундах.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Количество писем за один проход.',
+        )
+
+    def mark_failed(self, email, error):
+        email.mark_failed(
+            error,
+            settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            settings.EMAIL_OUTBOX_RETRY_BACKOFF,
+        )
+
+    def send_batch(self, emails):
+        """Отправляет пачку писем, возвращает (отправлено, ошибок)."""
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as error:
+            for email in emails:
+                self.mark_failed(email, error)
+            return 0, len(emails)
+
+        sent = failed = 0
+        try:
+            for email in emails:
+                message = EmailMessage(
+                    subject=email.subject,
+                    body=email.message,
+                    from_email=email.from_email,
+                    to=[email.recipient],
+                    connection=connection,
+                )
+                try:
+                    message.send()
+                except Exception as error:
+                    self.mark_failed(email, error)
+                    failed += 1
+                    # Соединение могло оборваться: бэкенд переоткроет его
+                    # при следующей отправке.
+                    connection.close()
+                else:
+                    email.mark_sent()
+                    sent += 1
+        finally:
+            connection.close()
+        return sent, failed
+
+    def drain(self, batch_size):
+        """Отправляет все письма, время попытки которых наступило."""
+        sent = failed = 0
+        while True:
+            emails = list(OutboxEmail.objects.get_due(batch_size))
+            if not emails:
+                break
+            batch_sent, batch_failed = self.send_batch(emails)
+            sent += batch_sent
+            failed += batch_failed
+        return sent, failed
+
+    def handle(self, *args, **options) -> Optional[str]:
+        """Основное действие при выполнение команды."""
+        if not options['loop']:
+            sent, failed = self.drain(options['batch_size'])
+            return f'Отправлено писем: {sent}, ошибок: {failed}'
+
+        try:
+            while True:
+                close_old_connections()
+                sent, failed = self.drain(options['batch_size'])
+                if sent or failed:
+                    print(f'  > отправлено: {sent}, ошибок: {failed}')
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            return 'Воркер остановлен'
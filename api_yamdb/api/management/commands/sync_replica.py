@@ -0,0 +1,64 @@
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    """
+    Описание команды sync_replica.
+
+    Локальная замена репликации: копирует основную SQLite-бд в файл
+    реплики через backup API SQLite. Копия консистентна и снимается без
+    остановки приложения. В режиме --loop имитирует отставание реплики
+    на интервал синхронизации.
+    """
+
+    help = 'Копирует основную бд в реплику для чтения.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Синхронизировать в цикле с интервалом.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между синхронизациями в секундах.',
+        )
+
+    def sync(self):
+        source = connections[DEFAULT_DB_ALIAS]
+        target = connections[settings.READ_REPLICA_ALIAS]
+        source.ensure_connection()
+        target.ensure_connection()
+        source.connection.backup(target.connection)
+
+    def handle(self, *args, **options) -> Optional[str]:
+        """Основное действие при выполнение команды."""
+        alias = settings.READ_REPLICA_ALIAS
+        if alias not in settings.DATABASES:
+            raise CommandError(f'Бд `{alias}` не настроена в DATABASES')
+        if any(
+            connections[name].vendor != 'sqlite'
+            for name in (DEFAULT_DB_ALIAS, alias)
+        ):
+            raise CommandError(
+                'Команда работает только с SQLite, для других СУБД '
+                'используйте штатную репликацию'
+            )
+        if not options['loop']:
+            self.sync()
+            return 'Реплика синхронизирована'
+
+        try:
+            while True:
+                self.sync()
+                print(f'  > реплика синхронизирована {time.ctime()}')
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            return 'Синхронизация остановлена'
@@ -0,0 +1,33 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from .db_router import mark_recent_write, reset_read_alias
+
+
+class ReadReplicaMiddleware:
+    """
+    Обслуживает маршрутизацию чтений на реплику.
+
+    Сбрасывает выбор бд в начале и в конце запроса и запоминает
+    пользователей, успешно изменивших данные, для read-your-writes.
+    Пользователь берется после ответа: DRF проставляет в запрос
+    пользователя, аутентифицированного по JWT.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        reset_read_alias()
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_read_alias()
+        user = getattr(request, 'user', None)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and user is not None
+            and user.is_authenticated
+        ):
+            mark_recent_write(user)
+        return response
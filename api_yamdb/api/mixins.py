@@ -1,13 +1,154 @@
+from hashlib import md5
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Count, Max
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date, quote_etag
 from rest_framework import filters, mixins
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
-from rest_framework.status import HTTP_405_METHOD_NOT_ALLOWED
+from rest_framework.status import HTTP_200_OK, HTTP_405_METHOD_NOT_ALLOWED
 
+from .cache import (
+    build_list_cache_key,
+    get_cached_list,
+    get_catalog_version,
+    set_cached_list,
+)
+from .db_router import (
+    has_recent_write,
+    reset_read_alias,
+    use_read_replica,
+)
+from .pagination import CategoryGenrePagination
 from .permissions import AdminOrReadOnly
-from reviews.models import CustomUser
+from reviews.models import CustomUser, Review, Title
+
+
+class ReadReplicaMixin:
+    """
+    Миксин чтения с реплики для GET/HEAD-запросов.
+
+    Решение принимается после аутентификации: пользователь, недавно
+    изменивший данные, читает из основной бд (read-your-writes).
+    Сбрасывает выбор бд ReadReplicaMiddleware.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in ('GET', 'HEAD') and not has_recent_write(
+            request.user
+        ):
+            use_read_replica()
+
+
+def set_conditional_headers(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+
+
+class ConditionalListMixin:
+    """
+    Миксин условных GET-запросов (If-None-Match / If-Modified-Since).
+
+    Перед сериализацией выполняется дешевая проверка MAX(updated_at) и
+    COUNT по отфильтрованному кверисету, по ней строятся ETag и
+    Last-Modified. Если данные не изменились, сразу отдается 304.
+
+    conditional_dependencies - модели, вложенные в ответ: их изменения
+    тоже меняют ETag. conditional_related_fields - поля updated_at
+    связанных объектов (например, автора), они проверяются тем же
+    запросом через join.
+
+    Last-Modified отдается только для отдельного объекта: удаление из
+    списка не меняет MAX(updated_at), и клиент с If-Modified-Since
+    продолжал бы получать 304. Списки проверяются только по ETag,
+    который учитывает COUNT.
+    """
+
+    conditional_dependencies = ()
+    conditional_related_fields = ()
+
+    def is_conditional_detail(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return lookup_url_kwarg in self.kwargs
+
+    def get_conditional_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if self.is_conditional_detail():
+            # Как в rest_framework.generics.get_object_or_404: id
+            # неверного формата - это 404, а не ошибка сервера.
+            try:
+                queryset = queryset.filter(
+                    **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+                )
+            except (TypeError, ValueError, DjangoValidationError):
+                raise Http404
+        return queryset
+
+    def get_conditional_state(self):
+        """Возвращает ETag и время последнего изменения ответа."""
+        probe = {'last_modified': Max('updated_at'), 'count': Count('pk')}
+        related_probe = {
+            f'last_modified_{field}': Max(field)
+            for field in self.conditional_related_fields
+        }
+        state = [
+            self.get_conditional_queryset().order_by().aggregate(
+                **probe, **related_probe
+            )
+        ]
+        state.extend(
+            model.objects.aggregate(**probe)
+            for model in self.conditional_dependencies
+        )
+        last_modified = None
+        if self.is_conditional_detail():
+            last_modified = max(
+                (value for item in state for key, value in item.items()
+                 if key.startswith('last_modified') and value),
+                default=None
+            )
+        etag = md5(
+            f'{self.request.build_absolute_uri()}:{state}'.encode()
+        ).hexdigest()
+        return quote_etag(etag), (
+            int(last_modified.timestamp()) if last_modified else None
+        )
+
+    def conditional_get(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_conditional_state()
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == HTTP_200_OK:
+            set_conditional_headers(response, etag, last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_get(super().list, request, *args, **kwargs)
+
+
+class ConditionalGetMixin(ConditionalListMixin):
+    """Условные GET-запросы для списка и отдельного объекта."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(
+            super().retrieve, request, *args, **kwargs
+        )
 
 
 class CreateDestroyListNSIMixin(
+    ReadReplicaMixin,
+    ConditionalListMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     mixins.ListModelMixin,
@@ -21,7 +162,7 @@ class CreateDestroyListNSIMixin(
     """
     filter_backends = (filters.SearchFilter, )
     lookup_field = 'slug'
-    pagination_class = LimitOffsetPagination
+    pagination_class = CategoryGenrePagination
     permission_classes = (AdminOrReadOnly, )
     search_fields = ('name', )
 
@@ -37,6 +178,165 @@ class NoPutMethodMixin:
         return super().update(request, *args, **kwargs)
 
 
+class CatalogListCacheMixin:
+    """
+    Миксин кэширования списка для анонимных GET-запросов.
+
+    Ключ кэша включает версию каталога, которая увеличивается при любом
+    изменении каталога, поэтому устаревшие ответы никогда не отдаются.
+
+    Вместе с данными хранятся ETag и Last-Modified ответа: в MRO миксин
+    стоит перед ConditionalGetMixin, и попадание в кэш, в том числе с
+    ответом 304, обходится без запросов к бд.
+
+    При промахе данные читаются из основной бд, даже если вьюсет читает
+    с реплики: версия увеличивается после коммита, и отстающая реплика
+    положила бы под новую версию старые данные.
+    """
+
+    list_cache_prefix = None
+
+    def list(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+
+        key = build_list_cache_key(
+            self.list_cache_prefix, request, get_catalog_version()
+        )
+        cached = get_cached_list(key)
+        if cached is not None:
+            return self.get_cached_response(request, cached)
+
+        reset_read_alias()
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == HTTP_200_OK:
+            set_cached_list(key, {
+                'data': response.data,
+                'etag': response.get('ETag'),
+                'last_modified': response.get('Last-Modified'),
+            })
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def get_cached_response(self, request, cached):
+        etag = cached['etag']
+        last_modified = cached['last_modified'] and parse_http_date(
+            cached['last_modified']
+        )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = Response(cached['data'])
+            if etag:
+                set_conditional_headers(response, etag, last_modified)
+        response['X-Cache'] = 'HIT'
+        return response
+
+
+class SparseFieldsetMixin:
+    """
+    Миксин вьюсета для выборки части полей через ?fields=.
+
+    sparse_fieldset сопоставляет поле ответа с полями модели, которые
+    нужны для его вывода: остальные поля не загружаются из бд (only),
+    а сериалайзер выводит только запрошенные поля.
+    """
+
+    fields_query_param = 'fields'
+    sparse_fieldset = {}
+    sparse_required_fields = ('id',)
+
+    def get_sparse_fields(self):
+        """Возвращает запрошенные поля или None, если нужны все."""
+        if self.request.method not in SAFE_METHODS:
+            return None
+        value = self.request.query_params.get(self.fields_query_param)
+        if not value:
+            return None
+        fields = {name.strip() for name in value.split(',') if name.strip()}
+        unknown = fields - self.sparse_fieldset.keys()
+        if unknown:
+            raise ValidationError(
+                {self.fields_query_param: (
+                    f'Неизвестные поля: {", ".join(sorted(unknown))}.'
+                )}
+            )
+        return fields
+
+    def is_field_requested(self, name):
+        fields = self.get_sparse_fields()
+        return fields is None or name in fields
+
+    def apply_sparse_fieldset(self, queryset):
+        """Ограничивает загружаемые из бд поля запрошенными."""
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        model_fields = set(self.sparse_required_fields)
+        for name in fields:
+            model_fields.update(self.sparse_fieldset[name])
+        return queryset.only(*model_fields)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_sparse_fields()
+        return context
+
+
+class SparseFieldsSerializerMixin:
+    """Миксин сериалайзера, убирающий поля, не указанные в ?fields=."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')
+        if fields:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
+class NestedParentMixin:
+    """
+    Миксин вложенных вьюсетов отзывов и комментариев.
+
+    Произведение и отзыв из url ищутся один раз за запрос: вьюсет создается
+    на каждый запрос, поэтому результат хранится в его атрибутах и
+    переиспользуется в get_queryset, perform_create, пермишенах и
+    сериалайзерах (через context['view']).
+    """
+
+    _title = None
+    _review = None
+
+    def get_title(self):
+        """Произведение из url, 404 если его нет."""
+        if self._title is None:
+            if self.kwargs.get('review_id') is not None:
+                self._title = self.get_review().title
+            else:
+                self._title = get_object_or_404(
+                    Title.objects.only('id'), pk=self.kwargs.get('title_id')
+                )
+        return self._title
+
+    def get_review(self):
+        """
+        Отзыв из url вместе с произведением.
+
+        Принадлежность отзыва произведению проверяется тем же запросом.
+        """
+        if self._review is None:
+            self._review = get_object_or_404(
+                Review.objects.select_related('title').only(
+                    'id', 'title__id'
+                ),
+                pk=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id')
+            )
+            self._title = self._review.title
+        return self._review
+
+
 class CommonUserSerializerFieldsMixin:
     """Миксин для исключения повторения полей сериалайзера для User."""
     class Meta:
@@ -0,0 +1,114 @@
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    LimitOffsetPagination,
+    PageNumberPagination,
+)
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Курсорная (keyset) пагинация.
+
+    Не выполняет COUNT и OFFSET: следующая страница выбирается условием
+    по полю сортировки из непрозрачного курсора.
+    """
+
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Курсор строится только по заданному ключу пагинатора.
+
+        Параметр ?ordering в курсорном режиме не учитывается: ключ
+        должен быть уникальным и не содержать NULL.
+        """
+        return self.ordering
+
+
+class OptionalCursorPagination(BasePagination):
+    """
+    Пагинатор с опциональным курсорным режимом.
+
+    По умолчанию работает как default_pagination_class, чтобы не ломать
+    существующих клиентов. Курсорный режим включается параметром
+    ?pagination=cursor или наличием параметра cursor в запросе.
+    """
+
+    default_pagination_class = PageNumberPagination
+    cursor_pagination_class = KeysetPagination
+    cursor_ordering = ('id',)
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+
+    def __init__(self):
+        self.paginator = None
+
+    def is_cursor_mode(self, request):
+        """Проверяет, запрошен ли курсорный режим пагинации."""
+        return (
+            request.query_params.get(self.mode_query_param) == self.cursor_mode
+            or self.cursor_pagination_class.cursor_query_param
+            in request.query_params
+        )
+
+    def get_paginator(self, request):
+        """Возвращает пагинатор для режима, запрошенного клиентом."""
+        if not self.is_cursor_mode(request):
+            return self.default_pagination_class()
+        paginator = self.cursor_pagination_class()
+        paginator.ordering = self.cursor_ordering
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.default_pagination_class().get_paginated_response_schema(
+            schema
+        )
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_schema_operation_parameters(self, view):
+        parameters = {}
+        for pagination_class in (
+            self.default_pagination_class, self.cursor_pagination_class
+        ):
+            for parameter in (
+                pagination_class().get_schema_operation_parameters(view)
+            ):
+                parameters.setdefault(parameter['name'], parameter)
+        return list(parameters.values())
+
+
+class CategoryGenrePagination(OptionalCursorPagination):
+    """Пагинация справочников: limit/offset или курсор по наименованию."""
+
+    default_pagination_class = LimitOffsetPagination
+    cursor_ordering = ('name',)
+
+
+class TitlePagination(OptionalCursorPagination):
+    """Пагинация произведений: limit/offset или курсор по id."""
+
+    default_pagination_class = LimitOffsetPagination
+    cursor_ordering = ('id',)
+
+
+class ReviewCommentPagination(OptionalCursorPagination):
+    """
+    Пагинация отзывов и комментариев: страницы или курсор по дате.
+
+    Оба поля курсора по убыванию: тогда сортировку целиком обслуживает
+    индекс (родитель, pub_date), просматриваемый в обратном порядке.
+    """
+
+    default_pagination_class = PageNumberPagination
+    cursor_ordering = ('-pub_date', '-id')
@@ -53,7 +53,7 @@ class AdminModeratorAuthorPermission(BasePermission):
     def has_object_permission(self, request, view, obj):
         return (
             request.method in SAFE_METHODS
-            or obj.author == request.user
+            or obj.author_id == request.user.id
             or request.user.is_manager
             or request.user.is_superuser
         )
@@ -6,6 +6,7 @@ from .mixins import (
     CommonUserSerializerFieldsMixin,
     CommonReviewCommentSerializerMixin,
     CommonCategoryGenreSerializerMixin,
+    SparseFieldsSerializerMixin,
 )
 from .validators import (
     validate_username_allowed,
@@ -71,23 +72,41 @@ class TitleReadSerializer(serializers.ModelSerializer):
         return year
 
 
-class TitleViewSerializer(serializers.ModelSerializer):
+class TitleViewSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     """Сериалайзер произведений для методов на чтение."""
 
     genre = GenreSerializer(many=True, required=False,)
     category = CategorySerializer(required=True,)
     rating = serializers.FloatField(read_only=True)
+    # Каждый отзыв содержит оценку, поэтому это счетчик оценок рейтинга.
+    # При DEFERRED_RATINGS он, как и рейтинг, обновляется воркером
+    # process_dirty_titles и может отставать.
+    reviews_count = serializers.IntegerField(
+        source='rating_count', read_only=True
+    )
 
     class Meta:
         model = Title
         fields = (
-            'id', 'name', 'year', 'rating', 'description', 'genre', 'category',
+            'id', 'name', 'year', 'rating', 'reviews_count', 'description',
+            'genre', 'category',
         )
         read_only_fields = fields
 
 
+class ScoreCountSerializer(serializers.Serializer):
+    """Сериалайзер количества отзывов с заданной оценкой."""
+
+    score = serializers.IntegerField(read_only=True)
+    count = serializers.IntegerField(read_only=True)
+
+
 class CommentSerializer(
-    CommonReviewCommentSerializerMixin, serializers.ModelSerializer
+    SparseFieldsSerializerMixin,
+    CommonReviewCommentSerializerMixin,
+    serializers.ModelSerializer
 ):
     """Сериалайзер для комментариев."""
 
@@ -100,7 +119,9 @@ class CommentSerializer(
 
 
 class ReviewSerializer(
-    CommonReviewCommentSerializerMixin, serializers.ModelSerializer
+    SparseFieldsSerializerMixin,
+    CommonReviewCommentSerializerMixin,
+    serializers.ModelSerializer
 ):
     """Сериалайзер для Отзывов."""
 
@@ -126,7 +147,9 @@ class ReviewSerializer(
         return super().create(validated_data)
 
     class Meta(CommonReviewCommentSerializerMixin.Meta):
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
+        fields = (
+            'id', 'text', 'author', 'score', 'pub_date', 'comments_count'
+        )
         model = Review
 
 
@@ -157,11 +180,14 @@ class SelfUserRegistrationSerializer(serializers.ModelSerializer):
         model = CustomUser
         fields = ('username', 'email')
 
+    # Пользователь с этими username и email, найденный при валидации.
+    user = None
+
     def validate(self, data):
         username = data.get('username')
         email = data.get('email')
         validate_username_allowed(username)
-        validate_data_unique_together(username, email)
+        self.user = validate_data_unique_together(username, email)
         return data
 
 
@@ -194,9 +220,12 @@ class ObtainTokenSerializer(serializers.ModelSerializer):
         model = CustomUser
         fields = ('username', 'confirmation_code')
 
+    # Пользователь, для которого проверен код подтверждения.
+    user = None
+
     def validate(self, data):
         username = data.get('username')
         confirmation_code = data.get('confirmation_code')
         # Проверка confirmation_code для пользователя.
-        validate_confirmation_code(username, confirmation_code)
+        self.user = validate_confirmation_code(username, confirmation_code)
         return data
@@ -0,0 +1,63 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_token_version, user_cache
+from .cache import bump_catalog_version
+from reviews.models import (
+    Category,
+    CustomUser,
+    Genre,
+    GenreTitle,
+    Review,
+    Title,
+)
+
+CATALOG_MODELS = (Title, GenreTitle, Category, Genre, Review)
+
+
+def invalidate_catalog_cache(sender, **kwargs):
+    """
+    Увеличивает версию каталога после фиксации транзакции.
+
+    Если увеличить версию до коммита, параллельный запрос успеет
+    закэшировать старые данные уже под новой версией.
+    """
+    transaction.on_commit(bump_catalog_version)
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(
+        invalidate_catalog_cache,
+        sender=model,
+        dispatch_uid=f'catalog_cache_save_{model.__name__}'
+    )
+    post_delete.connect(
+        invalidate_catalog_cache,
+        sender=model,
+        dispatch_uid=f'catalog_cache_delete_{model.__name__}'
+    )
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_catalog_cache_on_genres(sender, action, **kwargs):
+    """Жанры через title.genre.set() сохраняются без post_save."""
+    if action.startswith('post_'):
+        invalidate_catalog_cache(sender)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """
+    Сбрасывает пользователя и версию его токенов в кэшах аутентификации.
+
+    Сброс повторяется после коммита: иначе параллельный запрос успел бы
+    закэшировать незафиксированную старую роль.
+    """
+    def invalidate():
+        user_cache.invalidate(instance.pk)
+        invalidate_token_version(instance.pk)
+
+    invalidate()
+    transaction.on_commit(invalidate)
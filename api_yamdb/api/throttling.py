@@ -0,0 +1,212 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+def take_token(tokens, updated_at, capacity, rate, now):
+    """
+    Пополняет корзину за прошедшее время и пытается взять из нее токен.
+
+    Возвращает (разрешено, остаток токенов, сколько секунд ждать).
+    """
+    tokens = min(capacity, tokens + (now - updated_at) * rate)
+    if tokens >= 1:
+        return True, tokens - 1, 0
+    return False, tokens, (1 - tokens) / rate
+
+
+class MemoryBucketStore:
+    """
+    Корзины в памяти процесса.
+
+    Число ключей ограничено max_keys: при переполнении вытесняются
+    давно не использованные, их корзины начинаются заново полными.
+    """
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate, now):
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            allowed, tokens, wait = take_token(
+                tokens, updated_at, capacity, rate, now
+            )
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBucketStore:
+    """
+    Корзины в отдельном SQLite-файле, общие для нескольких воркеров.
+
+    Файл не связан с основной бд, поэтому ограничение запросов не
+    конкурирует с ORM. Каждый поток держит свое соединение, списание
+    токена идет в транзакции BEGIN IMMEDIATE.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+
+    def get_connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS token_buckets ('
+                'key TEXT PRIMARY KEY, tokens REAL NOT NULL, '
+                'updated_at REAL NOT NULL)'
+            )
+            self._local.connection = connection
+        return connection
+
+    def take(self, key, capacity, rate, now):
+        connection = self.get_connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT tokens, updated_at FROM token_buckets WHERE key = ?',
+                (key,)
+            ).fetchone()
+            tokens, updated_at = row or (capacity, now)
+            allowed, tokens, wait = take_token(
+                tokens, updated_at, capacity, rate, now
+            )
+            connection.execute(
+                'INSERT OR REPLACE INTO token_buckets VALUES (?, ?, ?)',
+                (key, tokens, now)
+            )
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return allowed, wait
+
+    def clear(self):
+        self.get_connection().execute('DELETE FROM token_buckets')
+
+
+_stores = {}
+
+
+def get_bucket_store():
+    """Хранилище корзин по настройке AUTH_THROTTLE_STORE."""
+    if settings.AUTH_THROTTLE_STORE == 'sqlite':
+        key = ('sqlite', str(settings.AUTH_THROTTLE_SQLITE_PATH))
+        if key not in _stores:
+            _stores[key] = SQLiteBucketStore(key[1])
+    else:
+        key = ('memory', settings.AUTH_THROTTLE_MAX_KEYS)
+        if key not in _stores:
+            _stores[key] = MemoryBucketStore(key[1])
+    return _stores[key]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Базовый троттлинг по алгоритму token bucket.
+
+    Корзина вмещает burst токенов и пополняется со скоростью
+    per_minute токенов в минуту. Проверка выполняется в initial()
+    вьюхи, до какой-либо работы с ORM. Ключ корзины включает
+    throttle_scope вьюхи, поэтому у регистрации и выдачи токена
+    независимые лимиты.
+    """
+
+    burst = None
+    per_minute = None
+    timer = time.time
+
+    def __init__(self):
+        self.wait_seconds = 0
+
+    def get_keys(self, request, view):
+        raise NotImplementedError('.get_keys() must be overridden')
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', view.__class__.__name__)
+        store = get_bucket_store()
+        now = self.timer()
+        rate = self.per_minute / 60
+        allowed = True
+        for key in self.get_keys(request, view):
+            key_allowed, wait = store.take(
+                f'{scope}:{key}', self.burst, rate, now
+            )
+            if not key_allowed:
+                allowed = False
+                self.wait_seconds = max(self.wait_seconds, wait)
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Ограничение по IP-адресу клиента.
+
+    Без NUM_PROXIES в настройках DRF ключом служит REMOTE_ADDR:
+    заголовок X-Forwarded-For задает клиент, и, меняя его, бот
+    получал бы новую корзину на каждый запрос. За обратным прокси
+    нужно указать NUM_PROXIES - тогда адрес берется из
+    X-Forwarded-For с учетом числа доверенных прокси.
+    """
+
+    @property
+    def burst(self):
+        return settings.AUTH_THROTTLE_IP_BURST
+
+    @property
+    def per_minute(self):
+        return settings.AUTH_THROTTLE_IP_PER_MINUTE
+
+    def get_keys(self, request, view):
+        if api_settings.NUM_PROXIES is None:
+            return [f'ip:{request.META.get("REMOTE_ADDR")}']
+        return [f'ip:{self.get_ident(request)}']
+
+
+class IdentityTokenBucketThrottle(TokenBucketThrottle):
+    """Ограничение по username и email из тела запроса."""
+
+    identity_fields = ('username', 'email')
+
+    @property
+    def burst(self):
+        return settings.AUTH_THROTTLE_IDENTITY_BURST
+
+    @property
+    def per_minute(self):
+        return settings.AUTH_THROTTLE_IDENTITY_PER_MINUTE
+
+    def get_keys(self, request, view):
+        # Троттлинг идет до валидации: тело может быть списком или
+        # строкой, такой запрос отклонит сериализатор.
+        if not isinstance(request.data, Mapping):
+            return []
+        keys = []
+        for field in self.identity_fields:
+            value = request.data.get(field)
+            if isinstance(value, str) and value:
+                keys.append(f'{field}:{value.lower()}')
+        return keys
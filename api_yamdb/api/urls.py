@@ -12,7 +12,8 @@ from .views import (
     CommentViewSet,
     ReviewViewSet,
     UserAPIView,
-    ObtainTokenApiView
+    ObtainTokenApiView,
+    ReviewBulkCreateApiView,
 )
 
 
@@ -45,6 +46,11 @@ router.register(
 urlpatterns = [
     path('v1/auth/signup/', UserAPIView.as_view(), name='signup'),
     path('v1/auth/token/', ObtainTokenApiView.as_view(), name='token_obtain'),
+    path(
+        'v1/reviews/bulk/',
+        ReviewBulkCreateApiView.as_view(),
+        name='reviews_bulk'
+    ),
     path('v1/', include(router.urls)),
     path(add_version_url(''), include(router.urls)),
 ]
@@ -1,30 +1,41 @@
 import uuid
-from smtplib import SMTPException
 
-from rest_framework_simplejwt.tokens import AccessToken
-from django.core.mail import send_mail
 from django.conf import settings
+from django.db import transaction
+
+from .authentication import RoleAccessToken
+from reviews.models import OutboxEmail
 
 
 def generate_and_send_code(user):
-    """Отправляет код подтверждения регистрации на почту пользователю."""
+    """
+    Отправляет код подтверждения регистрации на почту пользователю.
+
+    Письмо ставится в очередь в одной транзакции с кодом и доставляется
+    командой send_outbox_emails, поэтому регистрация не ждет SMTP и не
+    падает при его недоступности.
+    """
     user.confirmation_code = str(uuid.uuid4())
-    user.save()
-    try:
-        send_mail(
+    with transaction.atomic():
+        if user.pk is None:
+            user.save()
+        else:
+            user.save(update_fields=('confirmation_code',))
+        OutboxEmail.objects.enqueue(
             subject='Код подтверждения.',
             message=f'Ваш код подтверждения:{user.confirmation_code}',
+            recipient=user.email,
             from_email=settings.MAIL_SEND_FROM,
-            recipient_list=[f'{user.email}'],
-            fail_silently=False,
         )
-    except SMTPException as error:
-        raise error
 
 
 def generate_user_token(user):
-    """Создает access- jwt токен для пользователя."""
-    access = AccessToken.for_user(user)
+    """
+    Создает access- jwt токен для пользователя.
+
+    Роль в токене позволяет проверять пермишены без запроса к бд.
+    """
+    access = RoleAccessToken.for_user(user)
     return {
         'access': str(access),
     }
@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.db.models import Q
 from rest_framework import serializers
 from rest_framework.exceptions import NotFound
 
@@ -24,19 +25,22 @@ def validate_data_unique_together(username, email):
     Валидатор проверяет предоставленные данные пользователем на корректность.
 
     Предоставленные username и email должны совпадать в бд, или оба
-    отсутствовать в бд, иначе ошибка валидации.
+    отсутствовать в бд, иначе ошибка валидации. Обе проверки делаются
+    одним запросом, найденный пользователь возвращается (или None).
     """
-    try:
-        user = CustomUser.objects.get(username=username)
-        if user.email != email:
-            raise serializers.ValidationError(
-                {'username': 'Никнейм занят.'}
-            )
-    except CustomUser.DoesNotExist:
-        if CustomUser.objects.filter(email=email).exists():
-            raise serializers.ValidationError(
-                {'email': 'Почта занята.'}
-            )
+    users = list(CustomUser.objects.filter(
+        Q(username=username) | Q(email=email)
+    )[:2])
+    user = next((user for user in users if user.username == username), None)
+    if user is not None and user.email != email:
+        raise serializers.ValidationError(
+            {'username': 'Никнейм занят.'}
+        )
+    if user is None and users:
+        raise serializers.ValidationError(
+            {'email': 'Почта занята.'}
+        )
+    return user
 
 
 def validate_confirmation_code(username, confirmation_code):
@@ -45,18 +49,19 @@ def validate_confirmation_code(username, confirmation_code):
 
     Если код из запроса и код юзера не сопвпадают, вызывается ошибка валидации.
     Если в бд нет юзера с переданным username, вызывается ошибка
-    NotFound - отсутствие объекта в бд.
+    NotFound - отсутствие объекта в бд. Возвращает найденного юзера.
     """
     try:
         user = CustomUser.objects.get(username=username)
-        if user.confirmation_code != confirmation_code:
-            raise serializers.ValidationError(
-                {'confirmation_code': 'Неверный код подтверждения.'}
-            )
     except CustomUser.DoesNotExist:
         raise NotFound(
             {'username': 'Такого пользователя не существует.'}
         )
+    if user.confirmation_code != confirmation_code:
+        raise serializers.ValidationError(
+            {'confirmation_code': 'Неверный код подтверждения.'}
+        )
+    return user
 
 
 def validate_score(value):
@@ -1,13 +1,17 @@
-from django.db.models import Avg
-from django.shortcuts import get_object_or_404
+from datetime import datetime, time
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.filters import SearchFilter
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.pagination import (
-    PageNumberPagination, LimitOffsetPagination
-)
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
@@ -17,10 +21,23 @@ from reviews.models import (
     Title,
     Review,
     CustomUser,
-    Comment
+    Comment,
+    ScoreCounter,
+)
+from .bulk import BulkReviewImporter
+from .export import ReviewExporter
+from .filters import StableOrderingFilter, TitleFilterSet, UserSearchFilter
+from .mixins import (
+    CatalogListCacheMixin,
+    ConditionalGetMixin,
+    CreateDestroyListNSIMixin,
+    NestedParentMixin,
+    NoPutMethodMixin,
+    ReadReplicaMixin,
+    SparseFieldsetMixin,
 )
-from .filters import TitleFilterSet
-from .mixins import CreateDestroyListNSIMixin, NoPutMethodMixin
+from .pagination import ReviewCommentPagination, TitlePagination
+from .parsers import NDJSONParser
 from .permissions import (
     OnlyAdminAllowed, AdminOrReadOnly, AdminModeratorAuthorPermission)
 from .serializers import (
@@ -34,7 +51,9 @@ from .serializers import (
     TitleViewSerializer,
     CommentSerializer,
     ReviewSerializer,
+    ScoreCountSerializer,
 )
+from .throttling import IdentityTokenBucketThrottle, IPTokenBucketThrottle
 from .utils import generate_and_send_code, generate_user_token
 
 
@@ -47,20 +66,15 @@ class UserAPIView(APIView):
 
     permission_classes = (AllowAny,)
     serializer_class = SelfUserRegistrationSerializer
+    throttle_classes = (IPTokenBucketThrottle, IdentityTokenBucketThrottle)
+    throttle_scope = 'signup'
 
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
-        username = serializer.validated_data['username']
-
-        if CustomUser.objects.filter(username=username).exists():
-            user = CustomUser.objects.get(username=username)
-            generate_and_send_code(user)
-            return Response(
-                serializer.data, status=status.HTTP_200_OK
-            )
-
-        user = serializer.save()
+        # Существующий пользователь уже найден при валидации, новый
+        # сохраняется вместе с кодом подтверждения одним INSERT.
+        user = serializer.user or CustomUser(**serializer.validated_data)
         generate_and_send_code(user)
         return Response(
             serializer.data, status=status.HTTP_200_OK
@@ -82,8 +96,8 @@ class AdminUserViewSet(
     permission_classes = (OnlyAdminAllowed,)
     lookup_field = 'username'
     pagination_class = PageNumberPagination
-    filter_backends = (SearchFilter,)
-    search_fields = ('username',)
+    filter_backends = (UserSearchFilter,)
+    search_fields = ('username', 'email')
 
     def create(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
@@ -122,13 +136,13 @@ class ObtainTokenApiView(APIView):
 
     permission_classes = (AllowAny,)
     serializer_class = ObtainTokenSerializer
+    throttle_classes = (IPTokenBucketThrottle, IdentityTokenBucketThrottle)
+    throttle_scope = 'token'
 
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
-        username = serializer.validated_data['username']
-        user = CustomUser.objects.get(username=username)
-        token = generate_user_token(user)
+        token = generate_user_token(serializer.user)
         return Response(
             {'token': token}, status=status.HTTP_200_OK
         )
@@ -151,61 +165,212 @@ class GenreViewSet(
 
 
 class TitleViewSet(
+    ReadReplicaMixin,
+    CatalogListCacheMixin,
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
     NoPutMethodMixin,
     viewsets.ModelViewSet
 ):
-    filter_backends = (DjangoFilterBackend, )
+    list_cache_prefix = 'titles:list'
+    filter_backends = (DjangoFilterBackend, StableOrderingFilter)
     filterset_class = TitleFilterSet
-    pagination_class = LimitOffsetPagination
+    ordering_fields = ('rating', 'year', 'name')
+    ordering = ('id',)
+    pagination_class = TitlePagination
     permission_classes = (AdminOrReadOnly,)
+    conditional_dependencies = (Category, Genre)
+    sparse_fieldset = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'rating': ('rating',),
+        'reviews_count': ('rating_count',),
+        'description': ('description',),
+        'genre': (),
+        'category': ('category',),
+    }
 
     def get_queryset(self):
-        return Title.objects.annotate(rating=Avg('reviews__score'))
+        # Категория подтягивается join-ом, жанры - одним пакетным запросом,
+        # поэтому число запросов не зависит от размера страницы.
+        queryset = Title.objects.all()
+        if self.is_field_requested('category'):
+            queryset = queryset.select_related('category')
+        if self.is_field_requested('genre'):
+            queryset = queryset.prefetch_related('genre')
+        return self.apply_sparse_fieldset(queryset)
 
     def get_serializer_class(self):
         if self.request.method in ('POST', 'PATCH'):
             return TitleReadSerializer
         return TitleViewSerializer
 
+    @action(detail=True,
+            url_path='rating-histogram',
+            methods=['get'])
+    def rating_histogram(self, request, pk=None):
+        """Распределение оценок произведения из счетчиков оценок."""
+        title = get_object_or_404(Title.objects.only('id'), pk=pk)
+        histogram = ScoreCounter.objects.get_histogram(title.id)
+        serializer = ScoreCountSerializer(
+            [
+                {'score': score, 'count': count}
+                for score, count in histogram.items()
+            ],
+            many=True
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 
 class CommentViewSet(
-    NoPutMethodMixin, viewsets.ModelViewSet
+    ReadReplicaMixin,
+    ConditionalGetMixin,
+    NestedParentMixin,
+    SparseFieldsetMixin,
+    NoPutMethodMixin,
+    viewsets.ModelViewSet
 ):
     serializer_class = CommentSerializer
+    pagination_class = ReviewCommentPagination
     permission_classes = (AdminModeratorAuthorPermission,)
-
-    def get_review(self):
-        """Получение объекта отзыва."""
-        review = get_object_or_404(
-            Review,
-            pk=self.kwargs.get('review_id'),
-            title_id=self.kwargs.get('title_id')
-        )
-        return review
+    conditional_related_fields = ('author__updated_at',)
+    sparse_fieldset = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'pub_date': ('pub_date',),
+    }
+    sparse_required_fields = ('id', 'pub_date')
 
     def get_queryset(self):
-        return Comment.objects.filter(review_id=self.get_review())
+        queryset = Comment.objects.filter(review=self.get_review())
+        if self.is_field_requested('author'):
+            # Имя автора загружается join-ом в том же запросе.
+            queryset = queryset.select_related('author')
+        return self.apply_sparse_fieldset(queryset)
 
     def perform_create(self, serializer):
         serializer.save(review=self.get_review(), author=self.request.user)
 
 
 class ReviewViewSet(
-    NoPutMethodMixin, viewsets.ModelViewSet
+    ReadReplicaMixin,
+    ConditionalGetMixin,
+    NestedParentMixin,
+    SparseFieldsetMixin,
+    NoPutMethodMixin,
+    viewsets.ModelViewSet
 ):
     serializer_class = ReviewSerializer
+    pagination_class = ReviewCommentPagination
     permission_classes = (AdminModeratorAuthorPermission,)
-
-    def get_title(self):
-        title = get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id'))
-        return title
+    conditional_related_fields = ('author__updated_at',)
+    sparse_fieldset = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'score': ('score',),
+        'pub_date': ('pub_date',),
+        'comments_count': ('comments_count',),
+    }
+    sparse_required_fields = ('id', 'pub_date')
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        queryset = Review.objects.filter(title=self.get_title())
+        if self.is_field_requested('author'):
+            # Имя автора загружается join-ом в том же запросе.
+            queryset = queryset.select_related('author')
+        return self.apply_sparse_fieldset(queryset)
 
     def perform_create(self, serializer):
-        user = self.request.user
-        score = self.request.data.get('score')
-        serializer.save(title=self.get_title(), author=user, score=score)
+        serializer.save(title=self.get_title(), author=self.request.user)
+
+    @action(detail=False,
+            url_path='export',
+            methods=['get'])
+    def export(self, request, *args, **kwargs):
+        """
+        Выгрузка всех отзывов произведения в NDJSON.
+
+        ?comments=true добавляет комментарии к каждому отзыву,
+        ?since=<ISO 8601> отдает только отзывы, измененные с этого момента.
+        """
+        exporter = ReviewExporter(
+            self.get_title(),
+            since=self.get_export_since(),
+            with_comments=request.query_params.get('comments') in (
+                '1', 'true', 'True'
+            ),
+            chunk_size=settings.EXPORT_CHUNK_SIZE,
+        )
+        return StreamingHttpResponse(
+            exporter, content_type=NDJSONParser.media_type
+        )
+
+    def get_export_since(self):
+        """
+        Момент из ?since= для инкрементальной выгрузки.
+
+        Принимает дату и время или только дату (с начала суток) в
+        формате ISO 8601, время без зоны считается в зоне проекта.
+        """
+        value = self.request.query_params.get('since')
+        if not value:
+            return None
+        try:
+            since = parse_datetime(value)
+            if since is None:
+                date = parse_date(value)
+                if date is not None:
+                    since = datetime.combine(date, time.min)
+        except ValueError:
+            since = None
+        if since is None:
+            raise ValidationError(
+                {'since': 'Ожидается дата или дата и время в формате '
+                          'ISO 8601.'}
+            )
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+
+class ReviewBulkCreateApiView(APIView):
+    """
+    Апи для пакетного импорта отзывов партнеров.
+
+    Принимает JSON-массив или NDJSON с отзывами к разным произведениям.
+    Доступен только админу и суперпользователю.
+    """
+
+    permission_classes = (OnlyAdminAllowed,)
+    parser_classes = (JSONParser, NDJSONParser)
+
+    def post(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {'detail': 'Ожидается список отзывов.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > settings.BULK_REVIEWS_MAX_ITEMS:
+            return Response(
+                {'detail': (
+                    'Слишком много отзывов, максимум '
+                    f'{settings.BULK_REVIEWS_MAX_ITEMS}.'
+                )},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        results = BulkReviewImporter(
+            settings.BULK_REVIEWS_BATCH_SIZE
+        ).run(items)
+        created = sum(result['status'] == 'created' for result in results)
+        return Response(
+            {
+                'created': created,
+                'errors': len(results) - created,
+                'results': results,
+            },
+            status=status.HTTP_200_OK
+        )
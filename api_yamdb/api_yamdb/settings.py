@@ -37,6 +37,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.ReadReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -67,9 +68,40 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+    },
+    # Реплика для чтения. Локально это копия основной бд, которую
+    # обновляет команда sync_replica; в тестах - зеркало default.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_ROUTERS = ['api.db_router.ReadReplicaRouter']
+
+# GET/HEAD-запросы каталога, отзывов и комментариев читают с реплики.
+# Перед включением реплику нужно заполнить командой sync_replica.
+READ_REPLICA_ENABLED = False
+READ_REPLICA_ALIAS = 'replica'
+# Сколько секунд после записи пользователь читает из основной бд.
+READ_YOUR_WRITES_WINDOW = 5
+
+
+# Cache
+# Для нескольких процессов LocMem нужно заменить на общий бэкенд, например
+# django.core.cache.backends.filebased.FileBasedCache или
+# django.core.cache.backends.db.DatabaseCache.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
+# Время жизни закэшированного списка произведений, в секундах.
+CATALOG_CACHE_TIMEOUT = 300
+
 
 # Password validation
 
@@ -122,7 +154,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
@@ -133,12 +165,59 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Ограничение запросов к регистрации и выдаче токена (token bucket):
+# корзина на BURST запросов, пополняется на PER_MINUTE запросов в минуту.
+# Для нескольких воркеров 'memory' нужно заменить на общий 'sqlite'.
+# Лимит по IP считается по REMOTE_ADDR. За обратным прокси задайте
+# REST_FRAMEWORK['NUM_PROXIES'], иначе все клиенты попадут в одну корзину.
+AUTH_THROTTLE_STORE = 'memory'
+AUTH_THROTTLE_SQLITE_PATH = BASE_DIR / 'throttle.sqlite3'
+AUTH_THROTTLE_MAX_KEYS = 100000
+AUTH_THROTTLE_IP_BURST = 30
+AUTH_THROTTLE_IP_PER_MINUTE = 30
+AUTH_THROTTLE_IDENTITY_BURST = 5
+AUTH_THROTTLE_IDENTITY_PER_MINUTE = 3
+
+# Поиск подстроки в username/email админкой пользователей через
+# триграммный FTS5-индекс (?search_mode=substring). Индекс обновляется
+# при каждом изменении пользователя; после включения выполнить migrate,
+# чтобы перестроить его. Без индекса поиск подстроки идет через icontains.
+USER_SEARCH_TRIGRAM = False
+
+# Кэш пользователей JWT-аутентификации в памяти процесса.
+JWT_USER_CACHE_SIZE = 1024
+# Изменения пользователя в других процессах видны не позже, чем через
+# столько секунд.
+JWT_USER_CACHE_TTL = 60
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 MAIL_SEND_FROM = 'balala@gmail.com'
 
+# Outbox: письма доставляет команда send_outbox_emails.
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+# Пауза перед первой повторной попыткой, в секундах; далее удваивается.
+EMAIL_OUTBOX_RETRY_BACKOFF = 30
+
 # Constants for validation Score for Review
 MAX_SCORE = 10
 MIN_SCORE = 1
 
+# Bulk review import
+BULK_REVIEWS_MAX_ITEMS = 50000
+BULK_REVIEWS_BATCH_SIZE = 1000
+
+# Streaming export of reviews
+EXPORT_CHUNK_SIZE = 500
+
+# Deferred rating recomputation: reviews only mark titles as dirty,
+# process_dirty_titles recomputes them in batches. rating_count (shown as
+# reviews_count) is deferred too: it lives on the same hot title row, so
+# it lags by up to RATING_MAX_STALENESS seconds when the worker is behind.
+DEFERRED_RATINGS = False
+RATING_MAX_STALENESS = 60
+RATING_WORKER_BATCH_SIZE = 500
+RATING_WORKER_INTERVAL = 1
+
 USERNAME_PATTERN = r'^[\w.@+-]+$'
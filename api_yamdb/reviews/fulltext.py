@@ -0,0 +1,157 @@
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.models.expressions import RawSQL
+
+# Триграммный токенизатор не находит подстроки короче трех символов.
+TRIGRAM_LENGTH = 3
+
+
+class TrigramIndex:
+    """
+    FTS5-таблица с триграммным токенизатором над колонками модели.
+
+    rowid записи индекса совпадает с id строки исходной таблицы. На
+    СУБД, отличных от SQLite, и на сборках SQLite без FTS5 индекс
+    недоступен - вызывающий код переходит на icontains.
+    """
+
+    def __init__(self, table, source_table, columns):
+        self.table = table
+        self.source_table = source_table
+        self.columns = columns
+        self._available = {}
+
+    def create(self, connection):
+        """Создает FTS5-таблицу, возвращает False, если это невозможно."""
+        if connection.vendor != 'sqlite':
+            return False
+        with connection.cursor() as cursor:
+            try:
+                cursor.execute(
+                    f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} '
+                    f'USING fts5({", ".join(self.columns)}, '
+                    "tokenize='trigram')"
+                )
+            except OperationalError:
+                return False
+        self._available.pop(connection.alias, None)
+        return True
+
+    def drop(self, connection):
+        if connection.vendor != 'sqlite':
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {self.table}')
+        self._available.pop(connection.alias, None)
+
+    def is_available(self, using=DEFAULT_DB_ALIAS):
+        """Проверяет наличие FTS-индекса, результат кэшируется на процесс."""
+        if using not in self._available:
+            connection = connections[using]
+            self._available[using] = (
+                connection.vendor == 'sqlite'
+                and self.table in connection.introspection.table_names()
+            )
+        return self._available[using]
+
+    def rebuild(self, using=DEFAULT_DB_ALIAS):
+        """Полностью перестраивает индекс по исходной таблице."""
+        if not self.is_available(using):
+            return
+        columns = ', '.join(self.columns)
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table}(rowid, {columns}) '
+                f'SELECT id, {columns} FROM {self.source_table}'
+            )
+
+    def index(self, obj, using=DEFAULT_DB_ALIAS, created=False):
+        """Добавляет или обновляет объект в индексе."""
+        if not self.is_available(using):
+            return
+        placeholders = ', '.join(['%s'] * len(self.columns))
+        with connections[using].cursor() as cursor:
+            if not created:
+                cursor.execute(
+                    f'DELETE FROM {self.table} WHERE rowid = %s', (obj.pk,)
+                )
+            cursor.execute(
+                f'INSERT INTO {self.table}(rowid, {", ".join(self.columns)}) '
+                f'VALUES (%s, {placeholders})',
+                (obj.pk, *(getattr(obj, column) for column in self.columns))
+            )
+
+    def unindex(self, obj, using=DEFAULT_DB_ALIAS):
+        if not self.is_available(using):
+            return
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE rowid = %s', (obj.pk,)
+            )
+
+    def search(self, queryset, value):
+        """
+        Фильтрует кверисет по вхождению подстроки в любую из колонок.
+
+        Возвращает None, если индекс недоступен или запрос слишком
+        короткий для триграмм.
+        """
+        if len(value) < TRIGRAM_LENGTH or not self.is_available(queryset.db):
+            return None
+        # Запрос в кавычках - фраза FTS5, кавычки внутри удваиваются.
+        phrase = '"{}"'.format(value.replace('"', '""'))
+        return queryset.filter(
+            id__in=RawSQL(
+                f'SELECT rowid FROM {self.table} '
+                f'WHERE {self.table} MATCH %s',
+                (phrase,)
+            )
+        )
+
+
+title_index = TrigramIndex('reviews_title_fts', 'reviews_title', ('name',))
+user_index = TrigramIndex(
+    'reviews_user_fts', 'reviews_customuser', ('username', 'email')
+)
+
+
+def create_title_index(connection):
+    """
+    Создает FTS5-таблицу для поиска по названиям произведений.
+
+    Возвращает False, если сборка SQLite не поддерживает FTS5 с
+    триграммным токенизатором - тогда поиск работает через icontains.
+    """
+    return title_index.create(connection)
+
+
+def drop_title_index(connection):
+    title_index.drop(connection)
+
+
+def rebuild_title_index(using=DEFAULT_DB_ALIAS):
+    """Полностью перестраивает FTS-индекс по таблице произведений."""
+    title_index.rebuild(using)
+
+
+def index_title(title, using=DEFAULT_DB_ALIAS):
+    """Добавляет или обновляет название произведения в индексе."""
+    title_index.index(title, using)
+
+
+def unindex_title(title, using=DEFAULT_DB_ALIAS):
+    title_index.unindex(title, using)
+
+
+def search_titles(queryset, value):
+    """
+    Фильтрует произведения по вхождению подстроки в название.
+
+    На SQLite с FTS5 используется триграммный индекс (регистр, в том
+    числе кириллицы, не учитывается). Для коротких запросов и других
+    СУБД - обычный icontains.
+    """
+    result = title_index.search(queryset, value)
+    if result is None:
+        return queryset.filter(name__icontains=value)
+    return result
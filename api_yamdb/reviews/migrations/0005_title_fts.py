@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from reviews.fulltext import (
+    create_title_index, drop_title_index, rebuild_title_index
+)
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if create_title_index(connection):
+        rebuild_title_index(connection.alias)
+
+
+def drop_index(apps, schema_editor):
+    drop_title_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_rating'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
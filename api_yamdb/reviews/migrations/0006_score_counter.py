@@ -0,0 +1,46 @@
+# Generated by Django 3.2 on 2026-10-18 06:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+
+
+def fill_score_counters(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    ScoreCounter = apps.get_model('reviews', 'ScoreCounter')
+    ScoreCounter.objects.bulk_create(
+        ScoreCounter(title_id=row['title'], score=row['score'],
+                     count=row['count'])
+        for row in Review.objects.order_by().values(
+            'title', 'score'
+        ).annotate(count=Count('id'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_title_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(verbose_name='Оценка')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_counters', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'счетчик оценок',
+                'verbose_name_plural': 'Счетчики оценок',
+                'default_related_name': 'score_counters',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='scorecounter',
+            constraint=models.UniqueConstraint(fields=('title', 'score'), name='unique_score_counter'),
+        ),
+        migrations.RunPython(fill_score_counters, migrations.RunPython.noop),
+    ]
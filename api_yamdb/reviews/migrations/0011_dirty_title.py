@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 06:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_review_comment_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirtyTitle',
+            fields=[
+                ('title_id', models.PositiveIntegerField(primary_key=True, serialize=False, verbose_name='Произведение')),
+                ('marked_at', models.DateTimeField(db_index=True, verbose_name='Дата отметки')),
+            ],
+            options={
+                'verbose_name': 'произведение с устаревшим рейтингом',
+                'verbose_name_plural': 'Произведения с устаревшим рейтингом',
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2 on 2026-10-18 06:52
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+from reviews.fulltext import user_index
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if user_index.create(connection):
+        user_index.rebuild(connection.alias)
+
+
+def drop_index(apps, schema_editor):
+    user_index.drop(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_customuser_token_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Lower('username'), name='user_username_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='user_email_lower_idx'),
+        ),
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.2 on 2026-10-18 07:06
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_user_search_indexes'),
+    ]
+
+    # На SQLite AddField пересоздает таблицу, а Django 3.2 не может
+    # пересоздать индексы по выражениям - они удаляются и создаются заново.
+    operations = [
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='user_username_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='user_email_lower_idx',
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Дата изменения'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Lower('username'), name='user_username_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='user_email_lower_idx'),
+        ),
+    ]
@@ -1,7 +1,14 @@
+from datetime import timedelta
+
 from django.core import validators
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
+from django.db.models import (
+    Case, Count, F, FloatField, OuterRef, Subquery, Sum, When
+)
+from django.db.models.functions import Cast, Coalesce, Lower
 
 from api_yamdb.settings import (
     MIN_SCORE,
@@ -51,12 +58,34 @@ class CustomUser(AbstractUser):
     bio = models.TextField(
         blank=True, verbose_name='О себе',
     )
+    # Имя пользователя выводится в отзывах и комментариях: по этому
+    # полю меняется их ETag.
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+        db_index=True
+    )
+    # Увеличивается при изменении полей, попадающих в claims токена:
+    # токены со старой версией перестают пропускать без проверки по бд.
+    token_version = models.PositiveIntegerField(
+        'Версия токенов',
+        default=0,
+        editable=False
+    )
+
+    # Поля, копируемые в access-токен (см. api.authentication).
+    TOKEN_CLAIM_FIELDS = ('role', 'is_superuser', 'is_active')
 
     class Meta:
         verbose_name = 'пользователя'
         verbose_name_plural = 'Пользователи'
         ordering = ('username', '-date_joined')
         default_related_name = 'users'
+        # Для поиска по префиксу username и email без учета регистра.
+        indexes = [
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+        ]
 
     def __str__(self):
         return self.username
@@ -69,6 +98,36 @@ class CustomUser(AbstractUser):
     def is_manager(self):
         return self.role in self.MANAGER_ROLES
 
+    # Значения TOKEN_CLAIM_FIELDS на момент загрузки из бд.
+    _saved_claims = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_claims = {
+            name: instance.__dict__[name]
+            for name in cls.TOKEN_CLAIM_FIELDS
+            if name in instance.__dict__
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Сохранение с увеличением версии токенов при смене роли."""
+        if self._saved_claims and any(
+            getattr(self, name) != value
+            for name, value in self._saved_claims.items()
+        ):
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self._saved_claims = {
+            name: self.__dict__[name]
+            for name in self.TOKEN_CLAIM_FIELDS
+            if name in self.__dict__
+        }
+
 
 class Category(models.Model):
     """Категории."""
@@ -83,6 +142,11 @@ class Category(models.Model):
         max_length=50,
         unique=True
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+        db_index=True
+    )
 
     class Meta:
         ordering = ('name',)
@@ -108,6 +172,11 @@ class Genre(models.Model):
         max_length=50,
         unique=True
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+        db_index=True
+    )
 
     class Meta:
         ordering = ('name', )
@@ -120,7 +189,81 @@ class Genre(models.Model):
         return self.name[:10]
 
 
-class TitleManager(models.Manager):
+def calculate_rating(rating_sum, rating_count):
+    """Средняя оценка или None, если оценок нет."""
+    if not rating_count:
+        return None
+    return rating_sum / rating_count
+
+
+class TitleQuerySet(models.QuerySet):
+    """Кверисет произведений с операциями над агрегатами рейтинга."""
+
+    def update_rating(self, title_id, score_delta, count_delta=0):
+        """
+        Инкрементально изменяет агрегаты рейтинга произведения.
+
+        Обновление выполняется одним UPDATE с F-выражениями, поэтому
+        конкурентные отзывы не перетирают друг друга.
+        """
+        rating_sum = F('rating_sum') + score_delta
+        rating_count = F('rating_count') + count_delta
+        return self.filter(pk=title_id).update(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            rating=Case(
+                When(rating_count=-count_delta, then=None),
+                default=Cast(rating_sum, FloatField()) / rating_count,
+                output_field=FloatField(),
+            ),
+            updated_at=timezone.now(),
+        )
+
+    def get_rating_drift(self):
+        """
+        Сравнивает сохраненные агрегаты рейтинга с данными отзывов.
+
+        Возвращает список кортежей (произведение, сумма, количество)
+        для произведений, у которых агрегаты разошлись с фактическими.
+        """
+        titles = self.only('id', 'rating_sum', 'rating_count', 'rating')
+        actual = {
+            row['title']: (row['total'], row['count'])
+            for row in Review.objects.filter(
+                title__in=titles.values('id')
+            ).order_by().values('title').annotate(
+                total=Sum('score'), count=Count('id')
+            )
+        }
+        drift = []
+        for title in titles:
+            total, count = actual.get(title.id, (0, 0))
+            if (
+                (title.rating_sum, title.rating_count) != (total, count)
+                or title.rating != calculate_rating(total, count)
+            ):
+                drift.append((title, total, count))
+        return drift
+
+    def rebuild_ratings(self):
+        """Пересчитывает агрегаты рейтинга с нуля, возвращает расхождения."""
+        with transaction.atomic():
+            drift = self.get_rating_drift()
+            now = timezone.now()
+            self.model.objects.bulk_update(
+                [
+                    self.model(id=title.id, rating_sum=total,
+                               rating_count=count,
+                               rating=calculate_rating(total, count),
+                               updated_at=now)
+                    for title, total, count in drift
+                ],
+                ('rating_sum', 'rating_count', 'rating', 'updated_at'),
+            )
+        return drift
+
+
+class TitleManager(models.Manager.from_queryset(TitleQuerySet)):
     """Менеджер для произведений."""
     def create_object(self, **extra_fields):
         category = extra_fields.get('category')
@@ -138,10 +281,12 @@ class Title(models.Model):
     name = models.CharField(
         verbose_name='Наименование',
         max_length=256,
+        db_index=True
     )
     year = models.PositiveIntegerField(
         verbose_name='Год',
-        validators=(validate_year,)
+        validators=(validate_year,),
+        db_index=True
     )
     description = models.TextField(
         verbose_name='Описание',
@@ -159,6 +304,28 @@ class Title(models.Model):
         through='GenreTitle',
         verbose_name='Жанр',
     )
+    # Денормализованные агрегаты рейтинга, поддерживаются сигналами отзывов.
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False
+    )
+    rating = models.FloatField(
+        verbose_name='Рейтинг',
+        null=True,
+        editable=False,
+        db_index=True
+    )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+        db_index=True
+    )
 
     objects = TitleManager()
 
@@ -166,6 +333,11 @@ class Title(models.Model):
         verbose_name = 'произведение'  # ВП для админки
         verbose_name_plural = 'Произведения'
         default_related_name = 'titles'
+        indexes = [
+            # Для выборки "лучшие в категории".
+            models.Index(fields=['category', '-rating'],
+                         name='title_category_rating_idx'),
+        ]
 
 
 class GenreTitle(models.Model):
@@ -194,17 +366,82 @@ class GenreTitle(models.Model):
         default_related_name = 'genre_titles'
 
 
-class ReviewManager(models.Manager):
-    """Менеджер для отзывов."""
+class AuthorObjectManager(models.Manager):
+    """Менеджер для объектов с автором."""
 
     def create_object(self, **extra_fields):
         author = extra_fields.get('author')
         obj_author = CustomUser.objects.get(id=author)
         extra_fields.update(author=obj_author)
 
-        review = self.model(**extra_fields)
-        review.save(using=self._db)
-        return review
+        obj = self.model(**extra_fields)
+        obj.save(using=self._db)
+        return obj
+
+
+class ReviewQuerySet(models.QuerySet):
+    """Кверисет отзывов с операциями над счетчиком комментариев."""
+
+    def update_comments_count(self, review_id, delta):
+        """Атомарно изменяет счетчик комментариев отзыва."""
+        return self.filter(pk=review_id).update(
+            comments_count=F('comments_count') + delta,
+            updated_at=timezone.now(),
+        )
+
+    def get_comments_count_drift(self):
+        """
+        Сравнивает счетчики комментариев с таблицей комментариев.
+
+        Возвращает список кортежей (отзыв, фактическое количество).
+        """
+        reviews = self.only('id', 'comments_count')
+        actual = dict(
+            Comment.objects.filter(
+                review__in=reviews.values('id')
+            ).order_by().values('review').annotate(
+                count=Count('id')
+            ).values_list('review', 'count')
+        )
+        return [
+            (review, actual.get(review.id, 0))
+            for review in reviews
+            if review.comments_count != actual.get(review.id, 0)
+        ]
+
+    def rebuild_comments_count(self):
+        """Пересчитывает счетчики комментариев, возвращает расхождения."""
+        with transaction.atomic():
+            drift = self.get_comments_count_drift()
+            now = timezone.now()
+            self.model.objects.bulk_update(
+                [
+                    self.model(id=review.id, comments_count=count,
+                               updated_at=now)
+                    for review, count in drift
+                ],
+                ('comments_count', 'updated_at'),
+            )
+        return drift
+
+    def recount_comments(self):
+        """
+        Пересчитывает счетчики комментариев одним UPDATE.
+
+        В отличие от rebuild_comments_count не загружает отзывы и не
+        возвращает расхождения - подходит для массовой загрузки.
+        """
+        count = Comment.objects.filter(
+            review=OuterRef('pk')
+        ).order_by().values('review').annotate(count=Count('id'))
+        return self.update(
+            comments_count=Coalesce(Subquery(count.values('count')), 0),
+            updated_at=timezone.now(),
+        )
+
+
+class ReviewManager(AuthorObjectManager.from_queryset(ReviewQuerySet)):
+    """Менеджер для отзывов."""
 
 
 class Review(models.Model):
@@ -237,9 +474,23 @@ class Review(models.Model):
         'Дата публикации',
         auto_now_add=True
     )
+    # Денормализованный счетчик, поддерживается сигналами комментариев.
+    comments_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+        db_index=True
+    )
 
     objects = ReviewManager()
 
+    # Оценка на момент загрузки из бд, нужна для расчета изменения рейтинга.
+    _saved_score = None
+
     class Meta:
         verbose_name = 'отзыв'
         verbose_name_plural = 'Отзывы'
@@ -252,9 +503,217 @@ class Review(models.Model):
             models.UniqueConstraint(fields=['title', 'author'],
                                     name='unique_review_author_title'),
         ]
+        # Индексы под выборки отзывов произведения и отзывов автора,
+        # отсортированные по дате: сортировка идет по индексу без temp b-tree.
+        indexes = [
+            models.Index(fields=['title', 'pub_date'],
+                         name='review_title_pub_date_idx'),
+            models.Index(fields=['author', 'pub_date'],
+                         name='review_author_pub_date_idx'),
+        ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_score = instance.__dict__.get('score')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Сохранение отзыва в одной транзакции с обновлением рейтинга."""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class ScoreCounterManager(models.Manager):
+    """Менеджер счетчиков оценок произведений."""
+
+    def increment(self, title_id, score, amount=1):
+        """Увеличивает счетчик оценки, создавая строку при отсутствии."""
+        self.bulk_create(
+            [self.model(title_id=title_id, score=score)],
+            ignore_conflicts=True,
+        )
+        self.filter(title_id=title_id, score=score).update(
+            count=F('count') + amount
+        )
+
+    def decrement(self, title_id, score):
+        self.filter(title_id=title_id, score=score).update(
+            count=F('count') - 1
+        )
+
+    def get_histogram(self, title_id):
+        """Возвращает словарь {оценка: количество} для всех оценок."""
+        histogram = dict.fromkeys(range(MIN_SCORE, MAX_SCORE + 1), 0)
+        histogram.update(
+            self.filter(title_id=title_id).values_list('score', 'count')
+        )
+        return histogram
+
+    def get_actual_counts(self, title_ids=None):
+        """Считает распределение оценок по таблице отзывов."""
+        reviews = Review.objects.order_by()
+        if title_ids is not None:
+            reviews = reviews.filter(title_id__in=title_ids)
+        return {
+            (row['title'], row['score']): row['count']
+            for row in reviews.values('title', 'score').annotate(
+                count=Count('id')
+            )
+        }
+
+    def get_drift(self):
+        """Возвращает id произведений с разошедшимися счетчиками."""
+        actual = self.get_actual_counts()
+        stored = {
+            (title_id, score): count
+            for title_id, score, count in self.filter(
+                count__gt=0
+            ).values_list('title_id', 'score', 'count')
+        }
+        return {
+            title_id
+            for title_id, score in actual.keys() | stored.keys()
+            if actual.get((title_id, score), 0)
+            != stored.get((title_id, score), 0)
+        }
+
+    def rebuild(self, title_ids):
+        """Пересоздает счетчики оценок указанных произведений."""
+        with transaction.atomic():
+            self.filter(title_id__in=title_ids).delete()
+            self.bulk_create(
+                self.model(title_id=title_id, score=score, count=count)
+                for (title_id, score), count in self.get_actual_counts(
+                    title_ids
+                ).items()
+            )
+
+
+class ScoreCounter(models.Model):
+    """Количество оценок каждого значения для произведения."""
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        verbose_name='Произведение'
+    )
+    score = models.PositiveSmallIntegerField('Оценка')
+    count = models.PositiveIntegerField('Количество', default=0)
 
-class CommentManager(ReviewManager):
+    objects = ScoreCounterManager()
+
+    class Meta:
+        verbose_name = 'счетчик оценок'
+        verbose_name_plural = 'Счетчики оценок'
+        default_related_name = 'score_counters'
+        constraints = [
+            models.UniqueConstraint(fields=['title', 'score'],
+                                    name='unique_score_counter'),
+        ]
+
+
+class DirtyTitleManager(models.Manager):
+    """Менеджер очереди произведений с устаревшим рейтингом."""
+
+    def mark(self, title_id):
+        """
+        Ставит произведение в очередь на пересчет рейтинга.
+
+        Повторные отметки схлопываются в одну строку и сохраняют время
+        первой отметки, по которому считается устаревание рейтинга.
+        """
+        self.bulk_create(
+            [self.model(title_id=title_id, marked_at=timezone.now())],
+            ignore_conflicts=True,
+        )
+
+    def is_stale(self, title_id, max_staleness):
+        """Проверяет, ждет ли произведение пересчета дольше допустимого."""
+        return self.filter(
+            title_id=title_id,
+            marked_at__lte=timezone.now() - max_staleness,
+        ).exists()
+
+    def get_queue_stats(self):
+        """Возвращает глубину очереди и возраст самой старой отметки."""
+        stats = self.aggregate(
+            depth=Count('title_id'), oldest=models.Min('marked_at')
+        )
+        oldest = stats['oldest']
+        return {
+            'depth': stats['depth'],
+            'oldest_age': (
+                (timezone.now() - oldest).total_seconds()
+                if oldest is not None else 0
+            ),
+        }
+
+    def claim(self, batch_size):
+        """
+        Забирает из очереди пачку самых старых произведений.
+
+        Строки удаляются до пересчета: отзыв, зафиксированный после
+        удаления, снова отметит произведение и попадет в следующую пачку.
+        """
+        with transaction.atomic():
+            title_ids = list(
+                self.order_by('marked_at').values_list(
+                    'title_id', flat=True
+                )[:batch_size]
+            )
+            self.filter(title_id__in=title_ids).delete()
+        return title_ids
+
+    def recompute(self, title_ids):
+        """Пересчитывает рейтинг и счетчики оценок произведений."""
+        with transaction.atomic():
+            Title.objects.filter(pk__in=title_ids).rebuild_ratings()
+            ScoreCounter.objects.rebuild(title_ids)
+
+    def process(self, batch_size):
+        """
+        Обрабатывает одну пачку очереди, возвращает id произведений.
+
+        При ошибке пересчета произведения возвращаются в очередь.
+        """
+        title_ids = self.claim(batch_size)
+        if not title_ids:
+            return title_ids
+        try:
+            self.recompute(title_ids)
+        except Exception:
+            for title_id in title_ids:
+                self.mark(title_id)
+            raise
+        return title_ids
+
+
+class DirtyTitle(models.Model):
+    """
+    Произведение, рейтинг которого ждет отложенного пересчета.
+
+    title_id намеренно не внешний ключ: отметка ставится и при каскадном
+    удалении отзывов вместе с произведением.
+    """
+
+    title_id = models.PositiveIntegerField(
+        'Произведение',
+        primary_key=True
+    )
+    marked_at = models.DateTimeField(
+        'Дата отметки',
+        db_index=True
+    )
+
+    objects = DirtyTitleManager()
+
+    class Meta:
+        verbose_name = 'произведение с устаревшим рейтингом'
+        verbose_name_plural = 'Произведения с устаревшим рейтингом'
+
+
+class CommentManager(AuthorObjectManager):
     """Менеджер для комментариев."""
 
     pass
@@ -277,6 +736,11 @@ class Comment(models.Model):
         'Дата публикации',
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+        db_index=True
+    )
 
     objects = CommentManager()
 
@@ -285,3 +749,110 @@ class Comment(models.Model):
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(fields=['review', 'pub_date'],
+                         name='comment_review_pub_date_idx'),
+            models.Index(fields=['author', 'pub_date'],
+                         name='comment_author_pub_date_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        """Сохранение комментария в одной транзакции со счетчиком."""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class OutboxEmailManager(models.Manager):
+    """Менеджер очереди исходящих писем."""
+
+    def enqueue(self, subject, message, recipient, from_email):
+        """Ставит письмо в очередь, вызывать в транзакции с изменением."""
+        return self.create(
+            subject=subject,
+            message=message,
+            recipient=recipient,
+            from_email=from_email,
+            next_attempt_at=timezone.now(),
+        )
+
+    def get_due(self, batch_size):
+        """Письма, ожидающие отправки, время попытки которых наступило."""
+        return self.filter(
+            status=OutboxEmail.PENDING,
+            next_attempt_at__lte=timezone.now(),
+        ).order_by('next_attempt_at', 'id')[:batch_size]
+
+
+class OutboxEmail(models.Model):
+    """
+    Исходящее письмо (transactional outbox).
+
+    Письмо сохраняется в одной транзакции с данными, ради которых оно
+    отправляется, и доставляется командой send_outbox_emails.
+    """
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    STATUSES = [
+        (PENDING, 'ожидает отправки'),
+        (SENT, 'отправлено'),
+        (FAILED, 'не доставлено'),
+    ]
+
+    subject = models.CharField('Тема', max_length=256)
+    message = models.TextField('Текст')
+    from_email = models.EmailField('Отправитель', max_length=254)
+    recipient = models.EmailField('Получатель', max_length=254)
+    status = models.CharField(
+        'Статус',
+        choices=STATUSES,
+        default=PENDING,
+        max_length=16
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    next_attempt_at = models.DateTimeField('Следующая попытка')
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Дата создания', auto_now_add=True)
+    sent_at = models.DateTimeField('Дата отправки', null=True, blank=True)
+
+    objects = OutboxEmailManager()
+
+    class Meta:
+        verbose_name = 'исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            # Выборка писем, ожидающих отправки, по времени попытки.
+            models.Index(fields=['status', 'next_attempt_at'],
+                         name='outbox_status_next_attempt_idx'),
+        ]
+
+    def mark_sent(self):
+        self.status = self.SENT
+        self.attempts += 1
+        self.sent_at = timezone.now()
+        self.last_error = ''
+        self.save(update_fields=(
+            'status', 'attempts', 'sent_at', 'last_error'
+        ))
+
+    def mark_failed(self, error, max_attempts, backoff):
+        """
+        Фиксирует неудачную попытку.
+
+        Следующая попытка откладывается экспоненциально: backoff,
+        2 * backoff, 4 * backoff... После max_attempts попыток письмо
+        помечается недоставленным.
+        """
+        self.attempts += 1
+        self.last_error = str(error)
+        if self.attempts >= max_attempts:
+            self.status = self.FAILED
+        else:
+            self.next_attempt_at = timezone.now() + timedelta(
+                seconds=backoff * 2 ** (self.attempts - 1)
+            )
+        self.save(update_fields=(
+            'status', 'attempts', 'last_error', 'next_attempt_at'
+        ))
@@ -0,0 +1,142 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .fulltext import (
+    index_title, rebuild_title_index, unindex_title, user_index
+)
+from .models import (
+    Comment, CustomUser, DirtyTitle, Review, ScoreCounter, Title
+)
+
+# Поля пользователя, попадающие в триграммный индекс.
+USER_INDEX_FIELDS = frozenset(user_index.columns)
+
+
+def defer_rating_update(title_id):
+    """
+    Откладывает пересчет рейтинга, если включен режим DEFERRED_RATINGS.
+
+    Вместо UPDATE строки произведения отзыв только ставит его в очередь,
+    рейтинг и количество отзывов (rating_count) пересчитывает команда
+    process_dirty_titles. Если отметка
+    старше RATING_MAX_STALENESS (воркер не успевает или не запущен),
+    рейтинг пересчитывается сразу. Возвращает False в синхронном режиме.
+    """
+    if not settings.DEFERRED_RATINGS:
+        return False
+    max_staleness = timedelta(seconds=settings.RATING_MAX_STALENESS)
+    if DirtyTitle.objects.is_stale(title_id, max_staleness):
+        DirtyTitle.objects.filter(title_id=title_id).delete()
+        DirtyTitle.objects.recompute([title_id])
+    else:
+        DirtyTitle.objects.mark(title_id)
+    return True
+
+
+def apply_rating_change(instance, created):
+    """Синхронно переносит изменение оценки отзыва в агрегаты."""
+    if created:
+        Title.objects.update_rating(instance.title_id, instance.score, 1)
+        ScoreCounter.objects.increment(instance.title_id, instance.score)
+    elif instance._saved_score is None:
+        # Исходная оценка неизвестна - пересчитываем рейтинг целиком.
+        Title.objects.filter(pk=instance.title_id).rebuild_ratings()
+        ScoreCounter.objects.rebuild([instance.title_id])
+    else:
+        Title.objects.update_rating(
+            instance.title_id, instance.score - instance._saved_score
+        )
+        ScoreCounter.objects.decrement(
+            instance.title_id, instance._saved_score
+        )
+        ScoreCounter.objects.increment(instance.title_id, instance.score)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, created, raw, **kwargs):
+    """
+    Обновляет рейтинг и счетчики оценок произведения при сохранении отзыва.
+
+    Review.save() открывает транзакцию, поэтому обновление рейтинга
+    фиксируется вместе с самим отзывом.
+    """
+    if raw or instance.score == instance._saved_score:
+        return
+    if not defer_rating_update(instance.title_id):
+        apply_rating_change(instance, created)
+    instance._saved_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    """
+    Вычитает оценку удаленного отзыва из рейтинга и счетчиков оценок.
+
+    Срабатывает и при каскадном удалении отзывов вместе с пользователем
+    или произведением внутри транзакции удаления.
+    """
+    if defer_rating_update(instance.title_id):
+        return
+    Title.objects.update_rating(instance.title_id, -instance.score, -1)
+    ScoreCounter.objects.decrement(instance.title_id, instance.score)
+
+
+@receiver(post_save, sender=Comment)
+def update_comments_count_on_save(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        Review.objects.update_comments_count(instance.review_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def update_comments_count_on_delete(sender, instance, **kwargs):
+    """Срабатывает и при каскадном удалении комментариев с автором."""
+    Review.objects.update_comments_count(instance.review_id, -1)
+
+
+@receiver(post_save, sender=Title)
+def index_title_on_save(sender, instance, using, **kwargs):
+    """Синхронизирует FTS-индекс названий при сохранении произведения."""
+    index_title(instance, using)
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title_on_delete(sender, instance, using, **kwargs):
+    unindex_title(instance, using)
+
+
+@receiver(post_save, sender=CustomUser)
+def index_user_on_save(sender, instance, created, update_fields, using,
+                       **kwargs):
+    """
+    Синхронизирует триграммный индекс пользователей (USER_SEARCH_TRIGRAM).
+
+    Сохранения, не затрагивающие username и email (например, код
+    подтверждения), индекс не трогают.
+    """
+    if not settings.USER_SEARCH_TRIGRAM:
+        return
+    if update_fields is not None and not USER_INDEX_FIELDS & update_fields:
+        return
+    user_index.index(instance, using, created)
+
+
+@receiver(post_delete, sender=CustomUser)
+def unindex_user_on_delete(sender, instance, using, **kwargs):
+    if settings.USER_SEARCH_TRIGRAM:
+        user_index.unindex(instance, using)
+
+
+def rebuild_fulltext_indexes_on_migrate(sender, using, **kwargs):
+    """
+    Перестраивает FTS-индексы после migrate и flush.
+
+    flush очищает только таблицы моделей, и без перестроения в индексе
+    остались бы удаленные записи. Индекс пользователей перестраивается
+    и после включения USER_SEARCH_TRIGRAM.
+    """
+    rebuild_title_index(using)
+    if settings.USER_SEARCH_TRIGRAM:
+        user_index.rebuild(using)
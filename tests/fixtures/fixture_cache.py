@@ -0,0 +1,16 @@
+import pytest
+from django.core.cache import cache
+
+from api.authentication import user_cache
+from api.throttling import get_bucket_store
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    user_cache.clear()
+    get_bucket_store().clear()
+    yield
+    cache.clear()
+    user_cache.clear()
+    get_bucket_store().clear()
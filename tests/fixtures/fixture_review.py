@@ -0,0 +1,34 @@
+import pytest
+
+from reviews.models import Comment, CustomUser, Review, Title
+
+
+@pytest.fixture
+def review():
+    """
+    Отзыв с комментариями для проверок запросов к бд.
+
+    Создается напрямую в бд: 3 произведения, у каждого по отзыву от 100
+    авторов, у первого отзыва первого произведения - комментарии всех
+    авторов.
+    """
+    titles = [
+        Title.objects.create(name=f'Произведение {idx}', year=2000)
+        for idx in range(3)
+    ]
+    CustomUser.objects.bulk_create(
+        CustomUser(username=f'author{idx}', email=f'{idx}@yamdb.fake')
+        for idx in range(100)
+    )
+    authors = CustomUser.objects.order_by('id')
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text='text', score=5)
+        for title in titles
+        for author in authors
+    )
+    review = Review.objects.filter(title=titles[0]).first()
+    Comment.objects.bulk_create(
+        Comment(review=review, author=author, text='text')
+        for author in authors
+    )
+    return review
@@ -0,0 +1,135 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from api.cache import get_catalog_version
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    HISTOGRAM_URL_TEMPLATE = '/api/v1/titles/{title_id}/rating-histogram/'
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_reviews(self, client, admin_client, admin,
+                                       user_client, user):
+        author_map = {admin: admin_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения обновляется при создании '
+            'отзыва.'
+        )
+
+        create_single_review(user_client, title_id, 'second', 8)
+        assert self.get_rating(client, title_id) == 6.5
+
+        response = admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            ),
+            data={'score': 9}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 8.5, (
+            'Проверьте, что рейтинг произведения обновляется при изменении '
+            'оценки отзыва.'
+        )
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 8, (
+            'Проверьте, что рейтинг произведения обновляется при удалении '
+            'отзыва.'
+        )
+
+        user.delete()
+        assert self.get_rating(client, title_id) is None, (
+            'Проверьте, что рейтинг произведения обновляется при каскадном '
+            'удалении отзывов вместе с пользователем.'
+        )
+
+    def test_02_rebuild_ratings_command(self, client, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        call_command('rebuild_ratings', '--check')
+
+        Title.objects.filter(pk=title_id).update(rating_sum=100)
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--check')
+
+        version = get_catalog_version()
+        call_command('rebuild_ratings')
+        call_command('rebuild_ratings', '--check')
+        assert get_catalog_version() != version, (
+            'Проверьте, что команда `rebuild_ratings` инвалидирует кэш '
+            'каталога, если исправила рейтинги.'
+        )
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает рейтинг '
+            'произведений по отзывам.'
+        )
+
+    def test_03_rating_histogram(self, client, admin_client, admin,
+                                 user_client, user):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'second', 8)
+        url = self.HISTOGRAM_URL_TEMPLATE.format(title_id=title_id)
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.HISTOGRAM_URL_TEMPLATE}` '
+            'возвращает ответ со статусом 200.'
+        )
+        histogram = {item['score']: item['count'] for item in response.json()}
+        assert histogram == {
+            score: int(score in (5, 8)) for score in range(1, 11)
+        }, (
+            f'Проверьте, что `{self.HISTOGRAM_URL_TEMPLATE}` возвращает '
+            'количество отзывов для каждой оценки от 1 до 10.'
+        )
+
+        admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            ),
+            data={'score': 8}
+        )
+        user.delete()
+        histogram = {
+            item['score']: item['count'] for item in client.get(url).json()
+        }
+        assert histogram[5] == 0 and histogram[8] == 1, (
+            'Проверьте, что счетчики оценок обновляются при изменении '
+            'и удалении отзывов.'
+        )
+        call_command('rebuild_ratings', '--check')
+
+        for missing_id in (title_id + 100, 'abc'):
+            response = client.get(
+                self.HISTOGRAM_URL_TEMPLATE.format(title_id=missing_id)
+            )
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что `{self.HISTOGRAM_URL_TEMPLATE}` для '
+                f'title_id={missing_id} возвращает ответ со статусом 404.'
+            )
@@ -0,0 +1,49 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+from tests.utils import count_page_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    @pytest.fixture
+    def titles(self):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genres = [
+            Genre.objects.create(name='Ужасы', slug='horror'),
+            Genre.objects.create(name='Комедия', slug='comedy'),
+        ]
+        titles = []
+        for idx in range(12):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000, category=category
+            )
+            title.genre.set(genres)
+            titles.append(title)
+        return titles
+
+    def test_01_titles_list_query_count(self, client, titles):
+        urls = (
+            f'{self.TITLES_URL}?limit={{limit}}',
+            f'{self.TITLES_URL}?genre=horror&category=films&limit={{limit}}',
+        )
+        for url in urls:
+            # Прогрев кэша справочников, используемого фильтрами.
+            client.get(url.format(limit=1))
+            small_page = count_page_queries(client, url.format(limit=2))
+            large_page = count_page_queries(client, url.format(limit=12))
+            assert small_page == large_page, (
+                f'Проверьте, что число запросов к бд при GET-запросе к `{url}` '
+                'не зависит от размера страницы.'
+            )
+
+    def test_02_title_detail_query_count(self, client, titles):
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0].id)
+        assert count_page_queries(client, url) <= 2, (
+            f'Проверьте, что при GET-запросе к `{url}` категория загружается '
+            'join-ом, а жанры - одним дополнительным запросом.'
+        )
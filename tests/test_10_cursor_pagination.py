@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def walk(self, client, url):
+        ids = []
+        pages = 0
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в курсорном режиме пагинации не выполняется '
+                'подсчет общего количества объектов.'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+            pages += 1
+        return ids, pages
+
+    def test_01_titles_cursor_pagination(self, client):
+        category = Category.objects.create(name='Фильм', slug='films')
+        expected_ids = [
+            Title.objects.create(
+                name=f'Произведение {idx}', year=2000, category=category
+            ).id
+            for idx in range(7)
+        ]
+
+        ids, pages = self.walk(
+            client, f'{self.TITLES_URL}?pagination=cursor&limit=3'
+        )
+        assert ids == expected_ids, (
+            f'Проверьте, что курсорная пагинация `{self.TITLES_URL}` '
+            'возвращает все произведения по возрастанию id без повторов.'
+        )
+        assert pages == 3
+
+        response = client.get(f'{self.TITLES_URL}?limit=3&offset=3')
+        data = response.json()
+        assert data['count'] == len(expected_ids), (
+            'Проверьте, что пагинация limit/offset осталась режимом '
+            'по умолчанию.'
+        )
+        assert [item['id'] for item in data['results']] == expected_ids[3:6]
+
+    def test_02_reviews_cursor_pagination(self, client, admin_client, admin,
+                                          user_client, user, moderator_client,
+                                          moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        ids, pages = self.walk(client, f'{url}?pagination=cursor&limit=2')
+        assert ids == [review['id'] for review in reversed(reviews)], (
+            f'Проверьте, что курсорная пагинация `{url}` возвращает отзывы '
+            'от новых к старым без повторов.'
+        )
+        assert pages == 2
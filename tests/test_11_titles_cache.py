@@ -0,0 +1,90 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.cache import get_cache_stats
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitlesCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_titles_list_cached(self, client, admin_client, capsys):
+        create_titles(admin_client)
+        url = f'{self.TITLES_URL}?genre=horror&year=1984'
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response['X-Cache'] == 'MISS'
+
+        response = client.get(f'{self.TITLES_URL}?year=1984&genre=horror')
+        assert response['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный анонимный GET-запрос к '
+            f'`{self.TITLES_URL}` с теми же фильтрами отдается из кэша.'
+        )
+        assert len(response.json()['results']) == 1
+        assert get_cache_stats() == {'hits': 1, 'misses': 1}
+        capsys.readouterr()
+        assert call_command('catalog_cache_stats') == (
+            'Доля попаданий: 50.0%'
+        ), (
+            'Проверьте, что команда `catalog_cache_stats` выводит счетчики '
+            'кэша каталога.'
+        )
+        assert 'промахов: 1' in capsys.readouterr().out
+
+        response = admin_client.get(url)
+        assert 'X-Cache' not in response, (
+            'Проверьте, что запросы авторизованных пользователей '
+            'не кэшируются.'
+        )
+
+    def test_02_titles_cache_invalidated_on_write(self, client, admin_client,
+                                                  user_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        assert response.json()['results'][0]['rating'] is None
+
+        create_single_review(user_client, titles[0]['id'], 'text', 7)
+        response = client.get(self.TITLES_URL)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что кэш списка произведений инвалидируется '
+            'при создании отзыва.'
+        )
+        assert response.json()['results'][0]['rating'] == 7
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'genre': ['drama']}
+        )
+        response = client.get(f'{self.TITLES_URL}?genre=drama')
+        assert response['X-Cache'] == 'MISS'
+        assert len(response.json()['results']) == 2, (
+            'Проверьте, что кэш списка произведений инвалидируется '
+            'при изменении жанров произведения.'
+        )
+
+    def test_03_cache_hit_without_queries(self, client, admin_client):
+        create_titles(admin_client)
+        etag = client.get(self.TITLES_URL)['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.TITLES_URL)
+        assert response['X-Cache'] == 'HIT'
+        assert len(queries) == 0, (
+            f'Проверьте, что попадание в кэш `{self.TITLES_URL}` не '
+            'обращается к бд, в том числе для проверки ETag.'
+        )
+        assert response['ETag'] == etag
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что закэшированный список отвечает 304 на '
+            'актуальный `If-None-Match`.'
+        )
+        assert len(queries) == 0
@@ -0,0 +1,37 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, name):
+        response = client.get(self.TITLES_URL, {'name': name})
+        assert response.status_code == 200
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_name_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+
+        assert self.search(client, 'ТЕРМИН') == ['Терминатор'], (
+            f'Проверьте, что фильтр `name` для `{self.TITLES_URL}` ищет '
+            'по вхождению подстроки без учета регистра.'
+        )
+        assert self.search(client, 'орешек') == ['Крепкий орешек']
+        assert self.search(client, 'Кр') == ['Крепкий орешек']
+        assert self.search(client, 'Чужой') == []
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'Чужой'}
+        )
+        assert self.search(client, 'Термин') == [], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'названия произведения.'
+        )
+        assert self.search(client, 'чужой') == ['Чужой']
+
+        admin_client.delete(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        assert self.search(client, 'Чужой') == []
@@ -0,0 +1,66 @@
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def filter_names(self, client, **params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == 200
+        return sorted(title['name'] for title in response.json()['results'])
+
+    def test_01_multi_value_filters(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[1]["id"]}/',
+            data={'genre': ['drama', 'comedy']}
+        )
+
+        assert self.filter_names(client, genre='comedy,drama') == [
+            'Крепкий орешек', 'Терминатор'
+        ], (
+            f'Проверьте, что фильтр `genre` для `{self.TITLES_URL}` '
+            'принимает несколько жанров через запятую и не дублирует '
+            'произведения.'
+        )
+        assert self.filter_names(
+            client, genre='comedy,drama', genre_mode='all'
+        ) == ['Крепкий орешек'], (
+            'Проверьте, что при `genre_mode=all` возвращаются только '
+            'произведения со всеми перечисленными жанрами.'
+        )
+        assert self.filter_names(
+            client, genre='comedy,unknown', genre_mode='all'
+        ) == []
+        assert self.filter_names(client, genre='horror') == ['Терминатор']
+        assert self.filter_names(client, category='films,books') == [
+            'Крепкий орешек', 'Терминатор'
+        ]
+        assert self.filter_names(
+            client, category='books', genre='comedy'
+        ) == ['Крепкий орешек']
+
+    def test_02_titles_ordering(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[1]['id'], 'text', 8)
+        create_single_review(user_client, titles[0]['id'], 'text', 3)
+
+        response = client.get(self.TITLES_URL, {'ordering': '-rating'})
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            f'Проверьте, что `{self.TITLES_URL}` поддерживает сортировку '
+            'по рейтингу.'
+        )
+        response = client.get(self.TITLES_URL, {'ordering': '-year,name'})
+        assert [title['name'] for title in response.json()['results']] == [
+            'Крепкий орешек', 'Терминатор'
+        ]
+        response = client.get(self.TITLES_URL)
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[0]['id'], titles[1]['id']
+        ], 'Проверьте, что по умолчанию произведения упорядочены по id.'
@@ -0,0 +1,47 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, get_page_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_titles_sparse_fields(self, client, admin_client, admin):
+        create_reviews(admin_client, {admin: admin_client})
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL, {'fields': 'id,rating'})
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert all(set(title) == {'id', 'rating'} for title in results), (
+            f'Проверьте, что параметр `fields` для `{self.TITLES_URL}` '
+            'ограничивает поля в ответе.'
+        )
+        assert sorted(title['rating'] or 0 for title in results) == [0, 5]
+        sql = ' '.join(get_page_queries(context.captured_queries))
+        assert 'description' not in sql and 'reviews_genre' not in sql, (
+            'Проверьте, что незапрошенные поля и жанры не загружаются из бд.'
+        )
+
+        response = client.get(self.TITLES_URL, {'fields': 'id,unknown'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_reviews_sparse_fields(self, client, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response = client.get(url, {'fields': 'id,score'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == [
+            {'id': response.json()['results'][0]['id'], 'score': 5}
+        ], (
+            f'Проверьте, что параметр `fields` для `{url}` ограничивает '
+            'поля в ответе.'
+        )
@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_titles_not_modified(self, client, admin_client, admin,
+                                    user_client):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        detail_url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+
+        for url in (self.TITLES_URL, detail_url):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            etag = response['ETag']
+
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с актуальным '
+                '`If-None-Match` возвращает ответ со статусом 304.'
+            )
+
+        create_single_review(user_client, titles[0]['id'], 'text', 9)
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после нового отзыва ETag произведения меняется.'
+        )
+        assert response.json()['rating'] == 7
+
+    def test_02_reviews_not_modified(self, client, admin_client, admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response = client.get(url)
+        etag = response['ETag']
+        assert not response.has_header('Last-Modified'), (
+            f'Проверьте, что список `{url}` не отдает Last-Modified: '
+            'удаление не меняет MAX(updated_at).'
+        )
+        detail = client.get(f'{url}{reviews[0]["id"]}/')
+        assert detail.has_header('Last-Modified')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        admin_client.delete(f'{url}{reviews[0]["id"]}/')
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=detail['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после удаления отзыва `{url}` с '
+            '`If-Modified-Since` не возвращает 304.'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после удаления отзыва ETag `{url}` меняется.'
+        )
+        assert response.json()['results'] == []
+
+    def test_03_author_change_updates_etag(self, client, admin_client,
+                                           admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        admin_client.post(comments_url, data={'text': 'comment'})
+
+        for url in (reviews_url, comments_url):
+            etag = client.get(url)['ETag']
+            admin.username = f'{admin.username}x'
+            admin.save()
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что после изменения имени автора ETag `{url}` '
+                'меняется.'
+            )
+            assert response.json()['results'][0]['author'] == admin.username
+
+    def test_04_invalid_id_not_found(self, client, admin_client, admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for url in (
+            f'{self.TITLES_URL}abc/',
+            f'{reviews_url}abc/',
+            f'{reviews_url}{reviews[0]["id"]}/comments/abc/',
+        ):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `{url}` с id неверного формата '
+                'возвращает ответ со статусом 404.'
+            )
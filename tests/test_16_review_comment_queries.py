@@ -0,0 +1,95 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import count_page_queries, create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ReviewCommentQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_reviews_query_count(self, client, review):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=review.title_id)
+        assert (
+            count_page_queries(
+                client, url, {'pagination': 'cursor', 'limit': 10}, 10
+            )
+            == count_page_queries(
+                client, url, {'pagination': 'cursor', 'limit': 100}, 100
+            )
+        ), (
+            f'Проверьте, что число запросов к бд при GET-запросе к `{url}` '
+            'не зависит от количества отзывов на странице.'
+        )
+
+    def test_02_comments_query_count(self, client, review):
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=review.title_id, review_id=review.id
+        )
+        assert (
+            count_page_queries(
+                client, url, {'pagination': 'cursor', 'limit': 10}, 10
+            )
+            == count_page_queries(
+                client, url, {'pagination': 'cursor', 'limit': 100}, 100
+            )
+        ), (
+            f'Проверьте, что число запросов к бд при GET-запросе к `{url}` '
+            'не зависит от количества комментариев на странице.'
+        )
+
+    def test_03_parent_resolved_once(self, client, review):
+        urls = (
+            (self.REVIEWS_URL_TEMPLATE.format(title_id=review.title_id),
+             'FROM "reviews_title"'),
+            (self.COMMENTS_URL_TEMPLATE.format(
+                title_id=review.title_id, review_id=review.id
+            ), 'FROM "reviews_review"'),
+        )
+        for url, parent_lookup in urls:
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == 200
+            lookups = [
+                query for query in context.captured_queries
+                if parent_lookup in query['sql']
+            ]
+            assert len(lookups) == 1, (
+                f'Проверьте, что при GET-запросе к `{url}` родительский '
+                'объект из url запрашивается из бд один раз.'
+            )
+
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=review.title_id + 1, review_id=review.id
+        )
+        assert client.get(url).status_code == 404, (
+            'Проверьте, что отзыв другого произведения не найден.'
+        )
+
+    def test_04_comments_and_reviews_count(self, client, admin_client, admin,
+                                           user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        review = client.get(f'{url}{reviews[0]["id"]}/').json()
+        assert review['comments_count'] == 2, (
+            f'Проверьте, что `{url}<review_id>/` возвращает количество '
+            'комментариев в поле `comments_count`.'
+        )
+        title = client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert title['reviews_count'] == 2
+
+        user.delete()
+        review = client.get(f'{url}{reviews[0]["id"]}/').json()
+        assert review['comments_count'] == 1, (
+            'Проверьте, что счетчик комментариев уменьшается при каскадном '
+            'удалении комментариев вместе с пользователем.'
+        )
+        call_command('rebuild_comments_count', '--check')
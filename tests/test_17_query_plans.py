@@ -0,0 +1,52 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import explain
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17QueryPlans:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def check_plans(self, client, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, params)
+        assert response.status_code == 200
+        for query in context.captured_queries:
+            if not query['sql'].startswith('SELECT'):
+                continue
+            for detail in explain(query['sql']):
+                assert 'TEMP B-TREE' not in detail, (
+                    f'Проверьте индексы для GET-запроса к `{url}`: '
+                    f'сортировка выполняется во временном B-дереве.\n'
+                    f'{query["sql"]}\n{detail}'
+                )
+                assert not detail.startswith('SCAN'), (
+                    f'Проверьте индексы для GET-запроса к `{url}`: '
+                    f'выполняется полный просмотр таблицы.\n'
+                    f'{query["sql"]}\n{detail}'
+                )
+        return response
+
+    def test_01_reviews_plans(self, client, review):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=review.title_id)
+        self.check_plans(client, url)
+        response = self.check_plans(
+            client, url, {'pagination': 'cursor', 'limit': 5}
+        )
+        self.check_plans(client, response.json()['next'])
+
+    def test_02_comments_plans(self, client, review):
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=review.title_id, review_id=review.id
+        )
+        self.check_plans(client, url)
+        response = self.check_plans(
+            client, url, {'pagination': 'cursor', 'limit': 5}
+        )
+        self.check_plans(client, response.json()['next'])
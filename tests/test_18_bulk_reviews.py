@@ -0,0 +1,79 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18BulkReviews:
+
+    BULK_URL = '/api/v1/reviews/bulk/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_bulk_permissions(self, client, user_client, moderator_client):
+        for request_client in (client, user_client, moderator_client):
+            response = request_client.post(
+                self.BULK_URL, data='[]', content_type='application/json'
+            )
+            assert response.status_code in (
+                HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+            ), (
+                f'Проверьте, что `{self.BULK_URL}` доступен только админу.'
+            )
+
+    def test_02_bulk_json(self, client, admin_client, admin, user,
+                          user_client, moderator):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'text', 2)
+        items = [
+            {'title': titles[0]['id'], 'author': admin.username,
+             'text': 'ok', 'score': 10},
+            {'title': titles[0]['id'], 'author': moderator.username,
+             'text': 'ok', 'score': 6},
+            {'title': titles[1]['id'], 'author': admin.username,
+             'text': 'ok', 'score': 7},
+            {'title': titles[0]['id'], 'author': user.username,
+             'text': 'exists', 'score': 1},
+            {'title': titles[1]['id'], 'author': admin.username,
+             'text': 'duplicate', 'score': 1},
+            {'title': titles[1]['id'], 'author': 'nobody',
+             'text': 'no author', 'score': 1},
+            {'title': titles[1]['id'], 'author': user.username,
+             'text': 'bad score', 'score': 11},
+        ]
+        response = admin_client.post(self.BULK_URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['created'] == 3 and data['errors'] == 4
+        assert [result['status'] for result in data['results']] == [
+            'created', 'created', 'created', 'error', 'error', 'error', 'error'
+        ], (
+            f'Проверьте, что `{self.BULK_URL}` возвращает результат '
+            'для каждого отзыва.'
+        )
+
+        title = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        ).json()
+        assert title['rating'] == 6 and title['reviews_count'] == 3, (
+            'Проверьте, что пакетный импорт обновляет рейтинг произведений.'
+        )
+        call_command('rebuild_ratings', '--check')
+
+    def test_03_bulk_ndjson(self, admin_client, admin):
+        titles, _, _ = create_titles(admin_client)
+        body = '\n'.join(
+            json.dumps({'title': title['id'], 'author': admin.username,
+                        'text': 'ndjson', 'score': 5})
+            for title in titles
+        )
+        response = admin_client.post(
+            self.BULK_URL, data=body, content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['created'] == 2, (
+            f'Проверьте, что `{self.BULK_URL}` принимает NDJSON.'
+        )
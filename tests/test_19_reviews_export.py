@@ -0,0 +1,85 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from reviews.models import Comment, Review
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ReviewsExport:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/export/'
+
+    def export(self, client, title_id, **params):
+        response = client.get(
+            self.EXPORT_URL_TEMPLATE.format(title_id=title_id), params
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            f'Проверьте, что `{self.EXPORT_URL_TEMPLATE}` отдает потоковый '
+            'ответ.'
+        )
+        return [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+
+    def test_01_export(self, client, admin_client, admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+
+        rows = self.export(client, title_id)
+        assert [row['id'] for row in rows] == [
+            review['id'] for review in reviews
+        ], (
+            f'Проверьте, что `{self.EXPORT_URL_TEMPLATE}` выгружает все '
+            'отзывы произведения в формате NDJSON.'
+        )
+        assert 'comments' not in rows[0]
+
+        rows = self.export(client, title_id, comments='true')
+        assert [comment['text'] for comment in rows[0]['comments']] == [
+            comment['text'] for comment in comments
+        ]
+        assert rows[1]['comments'] == []
+
+        since = timezone.now()
+        Review.objects.get(pk=reviews[1]['id']).save()
+        rows = self.export(client, title_id, since=since.isoformat())
+        assert [row['id'] for row in rows] == [reviews[1]['id']], (
+            'Проверьте, что параметр `since` выгружает только отзывы, '
+            'измененные после указанного момента.'
+        )
+
+        since = timezone.now()
+        Comment.objects.get(pk=comments[0]['id']).save()
+        rows = self.export(
+            client, title_id, since=since.isoformat(), comments='true'
+        )
+        assert [row['id'] for row in rows] == [reviews[0]['id']], (
+            'Проверьте, что параметр `since` с `comments=true` выгружает '
+            'отзывы с измененными комментариями.'
+        )
+        assert self.export(client, title_id, since=since.isoformat()) == []
+
+        rows = self.export(
+            client, title_id, since=timezone.localdate(since).isoformat()
+        )
+        assert len(rows) == len(reviews), (
+            'Проверьте, что параметр `since` принимает дату без времени.'
+        )
+
+        for since in ('вчера', '2024-13-45T00:00:00', '2024-02-30'):
+            response = client.get(
+                self.EXPORT_URL_TEMPLATE.format(title_id=title_id),
+                {'since': since}
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `since={since}` возвращает ответ со '
+                'статусом 400.'
+            )
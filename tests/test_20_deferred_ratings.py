@@ -0,0 +1,74 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20DeferredRatings:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_deferred_rating(self, settings, client, admin_client, admin,
+                                user_client, user):
+        from reviews.models import DirtyTitle, ScoreCounter
+
+        settings.DEFERRED_RATINGS = True
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'second', 8)
+        assert self.get_rating(client, title_id) is None, (
+            'Проверьте, что в режиме DEFERRED_RATINGS отзыв не обновляет '
+            'рейтинг произведения синхронно.'
+        )
+        assert DirtyTitle.objects.get_queue_stats()['depth'] == 1, (
+            'Проверьте, что отзывы одного произведения схлопываются в одну '
+            'отметку очереди.'
+        )
+
+        call_command('process_dirty_titles')
+        assert self.get_rating(client, title_id) == 6.5, (
+            'Проверьте, что команда `process_dirty_titles` пересчитывает '
+            'рейтинг произведений из очереди.'
+        )
+        assert ScoreCounter.objects.get_histogram(title_id)[8] == 1
+        assert DirtyTitle.objects.get_queue_stats()['depth'] == 0
+        call_command('rebuild_ratings', '--check')
+
+        user.delete()
+        assert self.get_rating(client, title_id) == 6.5
+        call_command('process_dirty_titles')
+        assert self.get_rating(client, title_id) == 5
+
+    def test_02_max_staleness(self, settings, client, admin_client, admin,
+                              user_client):
+        from reviews.models import DirtyTitle
+
+        settings.DEFERRED_RATINGS = True
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        DirtyTitle.objects.update(
+            marked_at=DirtyTitle.objects.get().marked_at - timedelta(
+                seconds=settings.RATING_MAX_STALENESS + 1
+            )
+        )
+        assert DirtyTitle.objects.get_queue_stats()['oldest_age'] > (
+            settings.RATING_MAX_STALENESS
+        )
+
+        create_single_review(user_client, title_id, 'second', 8)
+        assert self.get_rating(client, title_id) == 6.5, (
+            'Проверьте, что рейтинг пересчитывается синхронно, если '
+            'произведение ждет в очереди дольше RATING_MAX_STALENESS.'
+        )
+        assert DirtyTitle.objects.get_queue_stats()['depth'] == 0
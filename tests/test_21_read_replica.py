@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+class Test21ReadReplica:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connections['default']) as primary:
+            with CaptureQueriesContext(connections['replica']) as replica:
+                response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return len(primary), len(replica)
+
+    def test_01_safe_methods_read_replica(self, settings, client,
+                                          admin_client, admin, user_client):
+        settings.READ_REPLICA_ENABLED = True
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        for list_url in ('/api/v1/categories/', '/api/v1/genres/', url):
+            primary, replica = self.get(client, list_url)
+            assert primary == 0 and replica > 0, (
+                f'Проверьте, что GET-запрос к `{list_url}` читает данные '
+                'с реплики.'
+            )
+
+        # Аутентификация идет до выбора бд и читает из основной.
+        _, replica = self.get(user_client, '/api/v1/titles/')
+        assert replica > 0, (
+            'Проверьте, что GET-запрос авторизованного пользователя к '
+            '`/api/v1/titles/` читает данные с реплики.'
+        )
+
+        settings.READ_REPLICA_ENABLED = False
+        primary, replica = self.get(client, url)
+        assert primary > 0 and replica == 0
+
+    def test_02_read_your_writes(self, settings, client, admin_client, admin,
+                                 user_client):
+        settings.READ_REPLICA_ENABLED = True
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        create_single_review(user_client, titles[0]['id'], 'second', 8)
+        primary, replica = self.get(user_client, url)
+        assert replica == 0, (
+            'Проверьте, что после записи пользователь читает данные из '
+            'основной бд в течение READ_YOUR_WRITES_WINDOW.'
+        )
+        primary, replica = self.get(client, url)
+        assert primary == 0 and replica > 0
+
+        settings.READ_YOUR_WRITES_WINDOW = 0
+        create_single_review(admin_client, titles[1]['id'], 'third', 3)
+        primary, replica = self.get(
+            admin_client,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        )
+        assert replica > 0
+
+    def test_03_list_cache_filled_from_primary(self, settings, client,
+                                               admin_client, admin):
+        settings.READ_REPLICA_ENABLED = True
+        create_reviews(admin_client, {admin: admin_client})
+
+        primary, replica = self.get(client, '/api/v1/titles/')
+        assert primary > 0 and replica == 0, (
+            'Проверьте, что кэш списка произведений заполняется из '
+            'основной бд, а не с отстающей реплики.'
+        )
+        assert self.get(client, '/api/v1/titles/') == (0, 0)
@@ -0,0 +1,99 @@
+from http import HTTPStatus
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client, username):
+        response = client.post(self.URL_SIGNUP, data={
+            'email': f'{username}@yamdb.fake', 'username': username
+        })
+        assert response.status_code == HTTPStatus.OK
+
+    def test_01_signup_enqueues_email(self, client, django_user_model):
+        from reviews.models import OutboxEmail
+
+        self.signup(client, 'first')
+        self.signup(client, 'second')
+        assert len(mail.outbox) == 0, (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` не '
+            'отправляет письмо синхронно, а ставит его в очередь.'
+        )
+        email = OutboxEmail.objects.get(recipient='first@yamdb.fake')
+        user = django_user_model.objects.get(username='first')
+        assert user.confirmation_code in email.message
+        assert email.status == OutboxEmail.PENDING
+
+        call_command('send_outbox_emails')
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            'first@yamdb.fake', 'second@yamdb.fake'
+        ], (
+            'Проверьте, что команда `send_outbox_emails` отправляет письма '
+            'из очереди.'
+        )
+        assert set(
+            OutboxEmail.objects.values_list('status', flat=True)
+        ) == {OutboxEmail.SENT}
+
+        call_command('send_outbox_emails')
+        assert len(mail.outbox) == 2, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_02_retry_with_backoff(self, settings, client, monkeypatch):
+        from reviews.models import OutboxEmail
+
+        self.signup(client, 'first')
+
+        def fail(self, messages):
+            raise SMTPException('SMTP недоступен')
+
+        with monkeypatch.context() as patch:
+            patch.setattr(EmailBackend, 'send_messages', fail)
+            call_command('send_outbox_emails')
+        email = OutboxEmail.objects.get()
+        assert email.status == OutboxEmail.PENDING
+        assert email.attempts == 1 and 'SMTP' in email.last_error
+        assert email.next_attempt_at > email.created_at, (
+            'Проверьте, что повторная попытка отправки откладывается.'
+        )
+
+        call_command('send_outbox_emails')
+        assert len(mail.outbox) == 0
+
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        OutboxEmail.objects.update(next_attempt_at=email.created_at)
+        with monkeypatch.context() as patch:
+            patch.setattr(EmailBackend, 'send_messages', fail)
+            call_command('send_outbox_emails')
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.FAILED, (
+            'Проверьте, что после EMAIL_OUTBOX_MAX_ATTEMPTS попыток письмо '
+            'помечается недоставленным.'
+        )
+
+    def test_03_filebased_backend(self, settings, client, tmp_path):
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.filebased.EmailBackend'
+        )
+        settings.EMAIL_FILE_PATH = tmp_path
+        self.signup(client, 'first')
+        self.signup(client, 'second')
+
+        call_command('send_outbox_emails')
+        files = list(tmp_path.iterdir())
+        assert len(files) == 1, (
+            'Проверьте, что письма одного прохода отправляются через одно '
+            'соединение с почтовым бэкендом.'
+        )
+        content = files[0].read_text()
+        assert 'first@yamdb.fake' in content
+        assert 'second@yamdb.fake' in content
@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23UserCache:
+
+    ME_URL = '/api/v1/users/me/'
+    USER_DETAIL_URL_TEMPLATE = '/api/v1/users/{username}/'
+
+    def get_me(self, client):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.ME_URL)
+        return response, len(queries)
+
+    def test_01_user_resolved_from_cache(self, user_client, user):
+        response, first_count = self.get_me(user_client)
+        assert response.status_code == HTTPStatus.OK
+        response, second_count = self.get_me(user_client)
+        assert response.status_code == HTTPStatus.OK
+        assert second_count == first_count - 1 == 0, (
+            'Проверьте, что пользователь JWT-аутентификации берется из '
+            'кэша без запроса к бд.'
+        )
+        assert response.json()['username'] == user.username
+
+        response = user_client.patch(self.ME_URL, data={'bio': 'new bio'})
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_me(user_client)[0].json()['bio'] == 'new bio'
+
+    def test_02_invalidation(self, admin_client, user_client, user):
+        self.get_me(user_client)
+        response = admin_client.patch(
+            self.USER_DETAIL_URL_TEMPLATE.format(username=user.username),
+            data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response, _ = self.get_me(user_client)
+        assert response.json()['role'] == 'admin', (
+            'Проверьте, что изменение роли пользователя сбрасывает его '
+            'в кэше аутентификации.'
+        )
+        response = user_client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.OK
+
+        user.delete()
+        response, _ = self.get_me(user_client)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что удаленный пользователь не аутентифицируется '
+            'из кэша.'
+        )
+
+    def test_03_ttl(self, monkeypatch, user_client, user):
+        from api.authentication import user_cache
+
+        monkeypatch.setattr(user_cache, 'ttl', -1)
+        self.get_me(user_client)
+        user.__class__.objects.filter(pk=user.pk).update(bio='updated')
+        response, count = self.get_me(user_client)
+        assert count == 1 and response.json()['bio'] == 'updated', (
+            'Проверьте, что записи кэша пользователей устаревают по TTL.'
+        )
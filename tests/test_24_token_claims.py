@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.utils import create_titles
+
+
+def get_role_client(user):
+    from api.utils import generate_user_token
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {generate_user_token(user)["access"]}'
+    )
+    return client
+
+
+def count_user_queries(queries):
+    return sum('"reviews_customuser"' in query['sql'] for query in queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24TokenClaims:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_token_claims(self, admin):
+        from api.utils import generate_user_token
+
+        token = AccessToken(generate_user_token(admin)['access'])
+        assert token['role'] == admin.role
+        assert token['is_superuser'] is False
+        assert token['ver'] == admin.token_version
+
+    def test_02_permission_without_user_query(self, admin):
+        client = get_role_client(admin)
+        client.get(self.CATEGORIES_URL)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(
+                self.CATEGORIES_URL, data={'name': 'Фильм', 'slug': 'films'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert count_user_queries(queries) == 0, (
+            'Проверьте, что пермишены проверяются по claims токена без '
+            'загрузки пользователя из бд.'
+        )
+
+    def test_03_role_demotion(self, user_superuser_client, admin):
+        client = get_role_client(admin)
+        response = user_superuser_client.patch(
+            f'/api/v1/users/{admin.username}/', data={'role': 'user'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = client.post(
+            self.CATEGORIES_URL, data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что после понижения роли старый токен не дает '
+            'прав администратора.'
+        )
+
+        admin.refresh_from_db()
+        admin.is_active = False
+        admin.save()
+        response = get_role_client(admin).get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_04_author_from_token(self, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        client = get_role_client(user)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.post(url, data={'text': 'Отзыв', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+
+        response = client.patch(
+            f'{url}{response.json()["id"]}/', data={'score': 8}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что автор может изменить свой отзыв с токеном, '
+            'содержащим роль.'
+        )
@@ -0,0 +1,105 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25AuthThrottle:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def signup(self, client, username, **extra):
+        return client.post(self.URL_SIGNUP, data={
+            'email': f'{username}@yamdb.fake', 'username': username
+        }, **extra)
+
+    def test_01_identity_bucket(self, settings, client):
+        for _ in range(settings.AUTH_THROTTLE_IDENTITY_BURST):
+            assert self.signup(client, 'bot').status_code == HTTPStatus.OK
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.signup(client, 'bot')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что повторные POST-запросы к `{self.URL_SIGNUP}` '
+            'с одним username ограничиваются.'
+        )
+        assert 'Retry-After' in response
+        assert len(queries) == 0, (
+            'Проверьте, что отклоненный запрос не обращается к бд.'
+        )
+        assert self.signup(client, 'human').status_code == HTTPStatus.OK
+
+        response = client.post(
+            self.URL_TOKEN, data={'username': 'bot', 'confirmation_code': 1}
+        )
+        assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что лимиты регистрации и выдачи токена независимы.'
+        )
+
+    def test_02_ip_bucket_and_refill(self, settings, monkeypatch, client):
+        from api.throttling import TokenBucketThrottle
+
+        settings.AUTH_THROTTLE_IP_BURST = 2
+        now = 1000.0
+        monkeypatch.setattr(TokenBucketThrottle, 'timer', lambda self: now)
+        assert self.signup(client, 'first').status_code == HTTPStatus.OK
+        assert self.signup(client, 'second').status_code == HTTPStatus.OK
+        response = self.signup(client, 'third')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запросы с одного IP ограничиваются.'
+        )
+        response = self.signup(client, 'third', REMOTE_ADDR='10.0.0.2')
+        assert response.status_code == HTTPStatus.OK
+
+        now += 60 / settings.AUTH_THROTTLE_IP_PER_MINUTE
+        assert self.signup(client, 'fourth').status_code == HTTPStatus.OK, (
+            'Проверьте, что корзина пополняется со временем.'
+        )
+
+    def test_03_sqlite_store(self, settings, client, tmp_path):
+        from api.throttling import SQLiteBucketStore, get_bucket_store
+
+        settings.AUTH_THROTTLE_STORE = 'sqlite'
+        settings.AUTH_THROTTLE_SQLITE_PATH = tmp_path / 'throttle.sqlite3'
+        settings.AUTH_THROTTLE_IDENTITY_BURST = 1
+        assert isinstance(get_bucket_store(), SQLiteBucketStore)
+        assert self.signup(client, 'bot').status_code == HTTPStatus.OK
+        response = self.signup(client, 'bot')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+        # Второй воркер с тем же файлом видит те же корзины.
+        other_worker = SQLiteBucketStore(settings.AUTH_THROTTLE_SQLITE_PATH)
+        allowed, _ = other_worker.take(
+            'signup:username:bot', 1, 1 / 60, time.time()
+        )
+        assert not allowed
+
+    def test_04_forwarded_for_does_not_reset_ip_bucket(self, settings,
+                                                       client):
+        settings.AUTH_THROTTLE_IP_BURST = 2
+        for number in range(2):
+            response = self.signup(
+                client, f'user{number}', HTTP_X_FORWARDED_FOR=f'1.1.1.{number}'
+            )
+            assert response.status_code == HTTPStatus.OK
+        response = self.signup(
+            client, 'user2', HTTP_X_FORWARDED_FOR='1.1.1.2'
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что без NUM_PROXIES заголовок X-Forwarded-For не '
+            'влияет на лимит по IP.'
+        )
+
+    @pytest.mark.parametrize('url', (URL_SIGNUP, URL_TOKEN))
+    def test_05_non_mapping_body(self, client, url):
+        response = client.post(
+            url, data=[1, 2], content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что POST-запрос к `{url}` со списком в теле '
+            'возвращает 400.'
+        )
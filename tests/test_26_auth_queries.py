@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26AuthQueries:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    VALID_DATA = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+    DATA_STATEMENTS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE')
+
+    def post(self, client, url, data):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(url, data=data)
+        # Управление транзакцией (BEGIN, SAVEPOINT) не считается.
+        return response, [
+            query['sql'] for query in queries
+            if query['sql'].startswith(self.DATA_STATEMENTS)
+        ]
+
+    def test_01_signup_queries(self, client):
+        response, queries = self.post(client, self.URL_SIGNUP, self.VALID_DATA)
+        assert response.status_code == HTTPStatus.OK
+        assert len(queries) == 3, (
+            f'Проверьте, что регистрация через `{self.URL_SIGNUP}` находит '
+            'пользователя одним запросом и создает его вместе с кодом '
+            'подтверждения: ожидается SELECT и два INSERT (пользователь '
+            'и письмо).'
+        )
+
+        response, queries = self.post(client, self.URL_SIGNUP, self.VALID_DATA)
+        assert response.status_code == HTTPStatus.OK
+        assert len(queries) == 3, (
+            f'Проверьте, что повторный запрос к `{self.URL_SIGNUP}` '
+            'выполняет SELECT, UPDATE кода подтверждения и INSERT письма.'
+        )
+        update = next(sql for sql in queries if sql.startswith('UPDATE'))
+        assert '"confirmation_code"' in update and '"email"' not in update, (
+            'Проверьте, что при повторной регистрации обновляется только '
+            'код подтверждения.'
+        )
+
+        response, queries = self.post(client, self.URL_SIGNUP, {
+            'email': 'other@yamdb.fake', 'username': 'valid_username'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert len(queries) == 1
+
+    def test_02_token_queries(self, client, django_user_model):
+        client.post(self.URL_SIGNUP, data=self.VALID_DATA)
+        user = django_user_model.objects.get(
+            username=self.VALID_DATA['username']
+        )
+
+        response, queries = self.post(client, self.URL_TOKEN, {
+            'username': user.username,
+            'confirmation_code': user.confirmation_code,
+        })
+        assert response.status_code == HTTPStatus.OK
+        assert len(queries) == 1, (
+            f'Проверьте, что `{self.URL_TOKEN}` загружает пользователя '
+            'одним запросом.'
+        )
+
+        response, queries = self.post(client, self.URL_TOKEN, {
+            'username': user.username, 'confirmation_code': 'wrong',
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert len(queries) == 1
@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import explain
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27UserSearch:
+
+    USERS_URL = '/api/v1/users/'
+
+    @pytest.fixture
+    def users(self, django_user_model):
+        return [
+            django_user_model.objects.create(
+                username=username, email=email
+            )
+            for username, email in (
+                ('Alpha', 'first@yamdb.fake'),
+                ('alphabet', 'second@yamdb.fake'),
+                ('beta', 'alpha.beta@yamdb.fake'),
+                ('omega', 'omega@yamdb.fake'),
+            )
+        ]
+
+    def search(self, client, value, **params):
+        response = client.get(self.USERS_URL, {'search': value, **params})
+        assert response.status_code == HTTPStatus.OK
+        return sorted(user['username'] for user in response.json()['results'])
+
+    def test_01_prefix_search(self, admin_client, users):
+        assert self.search(admin_client, 'ALP') == [
+            'Alpha', 'alphabet', 'beta'
+        ], (
+            f'Проверьте, что `{self.USERS_URL}?search=` ищет по префиксу '
+            'username и email без учета регистра.'
+        )
+        assert self.search(admin_client, 'pha') == []
+        assert self.search(admin_client, 'omega@') == ['omega']
+
+    def test_02_prefix_search_uses_indexes(self, admin_client, users):
+        with CaptureQueriesContext(connection) as context:
+            self.search(admin_client, 'alp')
+        plans = [
+            detail
+            for query in context.captured_queries
+            if 'reviews_customuser' in query['sql']
+            and 'LOWER' in query['sql']
+            for detail in explain(query['sql'])
+        ]
+        assert plans
+        assert not any(
+            detail.startswith('SCAN') and 'reviews_customuser' in detail
+            for detail in plans
+        ), (
+            'Проверьте, что поиск по префиксу не просматривает всю таблицу '
+            f'пользователей:\n{plans}'
+        )
+        assert any('user_username_lower_idx' in detail for detail in plans)
+        assert any('user_email_lower_idx' in detail for detail in plans)
+
+    def test_03_substring_search(self, settings, admin_client, admin, users):
+        from reviews.fulltext import user_index
+
+        assert self.search(
+            admin_client, 'pha', search_mode='substring'
+        ) == ['Alpha', 'alphabet', 'beta']
+
+        settings.USER_SEARCH_TRIGRAM = True
+        user_index.rebuild()
+        assert user_index.is_available()
+        assert self.search(
+            admin_client, 'PHA', search_mode='substring'
+        ) == ['Alpha', 'alphabet', 'beta'], (
+            'Проверьте, что поиск подстроки работает через триграммный '
+            'индекс пользователей.'
+        )
+        response = admin_client.patch(
+            f'{self.USERS_URL}omega/', data={'username': 'omphalos'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.search(
+            admin_client, 'pha', search_mode='substring'
+        ) == ['Alpha', 'alphabet', 'beta', 'omphalos']
@@ -0,0 +1,81 @@
+import csv
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28Dataloader:
+
+    def count_rows(self, filename):
+        from api.management.commands.dataloader import FULL_DIR
+
+        with open(FULL_DIR / filename, encoding='utf-8') as data:
+            return sum(1 for _ in csv.DictReader(data))
+
+    def test_01_bulk_loads_all_files(self, capsys):
+        from api.management.commands.dataloader import CSV_TO_MODEL_MAPPING
+        from reviews.models import Review
+
+        call_command('dataloader', '--bulk', '--batch-size', '10')
+
+        for filename, model in CSV_TO_MODEL_MAPPING.items():
+            assert model.objects.count() == self.count_rows(filename), (
+                f'Проверьте, что в режиме `--bulk` файл {filename} '
+                'загружается полностью.'
+            )
+        assert 'строк/с' in capsys.readouterr().out, (
+            'Проверьте, что в режиме `--bulk` команда выводит скорость '
+            'загрузки.'
+        )
+        call_command('rebuild_ratings', '--check')
+        assert not Review.objects.get_comments_count_drift(), (
+            'Проверьте, что после загрузки в режиме `--bulk` '
+            'пересчитываются счетчики комментариев.'
+        )
+
+    def test_02_bulk_matches_row_by_row(self):
+        from reviews.models import Title
+
+        call_command('dataloader')
+        expected = list(Title.objects.values_list(
+            'id', 'rating_sum', 'rating_count', 'category_id'
+        ).order_by('id'))
+
+        call_command('flush', '--no-input')
+        call_command('dataloader', '--bulk')
+        assert list(Title.objects.values_list(
+            'id', 'rating_sum', 'rating_count', 'category_id'
+        ).order_by('id')) == expected, (
+            'Проверьте, что режим `--bulk` загружает те же данные, что и '
+            'построчная загрузка.'
+        )
+
+    def test_03_bulk_rolls_back_file_with_bad_fk(self, tmp_path,
+                                                 monkeypatch):
+        from api.management.commands import dataloader
+        from reviews.models import Title
+
+        for filename in ('users.csv', 'category.csv', 'genre.csv'):
+            (tmp_path / filename).write_text(
+                (dataloader.FULL_DIR / filename).read_text(encoding='utf-8'),
+                encoding='utf-8'
+            )
+        for filename in ('genre_title.csv', 'review.csv', 'comments.csv'):
+            (tmp_path / filename).write_text(
+                (dataloader.FULL_DIR / filename).read_text(
+                    encoding='utf-8'
+                ).splitlines()[0] + '\n',
+                encoding='utf-8'
+            )
+        (tmp_path / 'titles.csv').write_text(
+            'id,name,year,category\n1,Первое,1990,1\n2,Второе,1991,999\n',
+            encoding='utf-8'
+        )
+        monkeypatch.setattr(dataloader, 'FULL_DIR', tmp_path)
+
+        call_command('dataloader', '--bulk', '--batch-size', '1')
+        assert not Title.objects.exists(), (
+            'Проверьте, что в режиме `--bulk` файл со ссылкой на '
+            'несуществующий объект откатывается целиком.'
+        )
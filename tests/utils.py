@@ -1,5 +1,8 @@
 from http import HTTPStatus
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 
 check_name_and_slug_patterns = (
     (
@@ -305,3 +308,33 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def get_page_queries(captured_queries):
+    """
+    SQL запросов, загружающих страницу.
+
+    Проверки ETag (MAX(updated_at)) не относятся к загрузке страницы и
+    отбрасываются.
+    """
+    return [
+        query['sql'] for query in captured_queries
+        if '"last_modified"' not in query['sql']
+    ]
+
+
+def count_page_queries(client, url, params=None, results=None):
+    """Считает запросы загрузки страницы, results - ожидаемый размер."""
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, params)
+    assert response.status_code == HTTPStatus.OK
+    if results is not None:
+        assert len(response.json()['results']) == results
+    return len(get_page_queries(context.captured_queries))
+
+
+def explain(sql):
+    """Строки плана запроса SQLite (EXPLAIN QUERY PLAN)."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]